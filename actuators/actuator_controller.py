@@ -1,127 +1,218 @@
 import asyncio
+import time
 import serial
+from datetime import datetime
 from config.settings import Settings
 from events.event_types import Event, EventType
+from utils import metrics
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+COMMANDS = metrics.counter('serial_commands', '아두이노 명령 전송 (ok, no_response, error, disconnected)', ('result',))
+ROUND_TRIP = metrics.histogram('serial_round_trip_seconds', '명령 전송부터 아두이노 수신 확인 줄(Received: ...)까지 시간')
+ACTIVE = metrics.gauge('actuators_active', '올라가 있는 액추에이터 수')
+RESTOCK = metrics.gauge('shelf_restock_slots', '보충이 필요한 슬롯 수')
 
 class ActuatorController:
     def __init__(self, event_bus, settings: Settings):
         self.event_bus = event_bus
         self.settings = settings
         self.serial = None
+        # 명령 전송과 그 응답 읽기를 한 쌍으로 직렬화 (동시에 보낸 명령이 서로의 응답을 읽지 않도록)
+        self.serial_lock = asyncio.Lock()
         self.active = set()
+
+        # 슬롯 번호 -> 마지막 판정 (스트리밍 중에는 슬롯별로 먼저 갱신됨), 채워야 할 슬롯
+        self.slot_states = {}
+        self.restock = set()
+        # 아두이노 액추에이터 번호 -> 보관함 슬롯 번호 (설정하지 않으면 비어 있어 생략 기능 꺼짐)
+        self.slot_of = {actuator_id.strip(): slot for slot, actuator_id in enumerate(settings.SHELF_SLOT_ACTUATORS)
+                        if actuator_id.strip()}
         
         self.event_bus.subscribe(EventType.ACTUATOR_POP, self.handle_pop)
         self.event_bus.subscribe(EventType.HUMAN_OUT, self.handle_down)
+        self.event_bus.subscribe(EventType.SHELF_ANALYZED, self.handle_shelf)
+        self.event_bus.subscribe(EventType.SHELF_SLOT_DECIDED, self.handle_slot)
 
     async def start(self):
-        """시리얼 연결 시작"""
+        """시리얼 연결 시작 - 아두이노가 준비되면 반환"""
+        loop = asyncio.get_running_loop()
         try:
-            self.serial = serial.Serial(
-                self.settings.SERIAL_PORT,
-                self.settings.SERIAL_BAUDRATE,
-                timeout=self.settings.SERIAL_TIMEOUT
-            )
-            print(f"아두이노 연결 성공: {self.settings.SERIAL_PORT}")
-            await asyncio.sleep(2)  # 아두이노 초기화 대기
-            
-            # 시작 시 모든 액추에이터 초기화
-            await self.send_command("0")
-            print("액추에이터 컨트롤러 시작됨")
+            # 포트 열기와 부팅 메시지 대기는 이벤트 루프 밖에서 (다른 서비스 초기화와 동시 진행)
+            self.serial = await loop.run_in_executor(None, self.open_serial)
+            log.info("아두이노 연결 성공", port=self.settings.SERIAL_PORT)
+            if not await loop.run_in_executor(None, self.wait_ready, 2.0):
+                log.warning("아두이노 준비 메시지 없음 - 계속 진행")
+
+            # 시작 시 모든 액추에이터 초기화 (정지 명령은 동작 시간 대기 불필요)
+            await self.send_command("0", wait=False)
+            log.info("액추에이터 컨트롤러 시작됨")
             
         except Exception as e:
-            print(f"아두이노 연결 실패: {e}")
+            log.error("아두이노 연결 실패", error=e)
             raise
 
+    def open_serial(self):
+        return serial.Serial(
+            self.settings.SERIAL_PORT,
+            self.settings.SERIAL_BAUDRATE,
+            timeout=self.settings.SERIAL_TIMEOUT
+        )
+
+    def wait_ready(self, timeout):
+        """고정 대기 대신 아두이노 setup() 의 'Arduino Ready' 메시지를 받는 즉시 True"""
+        deadline = time.monotonic() + timeout
+        read_timeout, self.serial.timeout = self.serial.timeout, 0.1
+        try:
+            while time.monotonic() < deadline:
+                line = self.serial.readline().decode('utf-8', errors='ignore')
+                if 'Ready' in line:
+                    return True
+            return False
+        finally:
+            self.serial.timeout = read_timeout
+
     async def handle_pop(self, event):
         """필요한 액추에이터들을 올리기"""
         needed_ids = event.detail['needed']
         if not needed_ids:
-            print("올릴 액추에이터가 없습니다.")
+            log.info("올릴 액추에이터가 없습니다.")
             # 액추에이터가 필요하지 않아도 카메라는 동작
             await self.event_bus.emit(Event(EventType.CAMERA_CAPTURE, {}))
             return
 
-        # 아두이노 코드에 맞게 ID 매핑
-        arduino_command = self.map_to_arduino_ids(needed_ids)
-        print(f"액추에이터 올리기: {needed_ids} -> 아두이노 명령: '{arduino_command}'")
+        # 규칙표가 정한 아두이노 액추에이터 번호 (예: ['1', '4'] -> "14")
+        arduino_command = self.skip_empty_slots(''.join(event.detail['targets']) or "0")
+        if not arduino_command:
+            log.info("필요한 슬롯이 모두 비어 있어 올릴 액추에이터가 없습니다.")
+            await self.event_bus.emit(Event(EventType.CAMERA_CAPTURE, {}))
+            return
+        log.info("액추에이터 올리기", needed=needed_ids, command=arduino_command)
         
         await self.send_command(arduino_command)
         
         # 활성화된 액추에이터 기록
         self.active.update(needed_ids)
+        await self.publish_state()
         
         # 액추에이터 팝업 후 카메라 캡처 이벤트 발생
-        print("액추에이터 팝업 완료 - 카메라 캡처 시작")
+        log.info("액추에이터 팝업 완료 - 카메라 캡처 시작")
         await self.event_bus.emit(Event(EventType.CAMERA_CAPTURE, {}))
 
     async def handle_down(self, event):
         """모든 활성화된 액추에이터 내리기"""
         if self.active:
-            print(f"액추에이터 내리기: {self.active}")
+            log.info("액추에이터 내리기", active=sorted(self.active))
             # 아두이노 코드에서 '6'은 모든 액추에이터를 내리는 명령
             await self.send_command("6")
             self.active.clear()
+            await self.publish_state()
         else:
-            print("내릴 액추에이터가 없습니다.")
-
-    def map_to_arduino_ids(self, needed_ids):
-        """Python 서비스의 ID를 아두이노 명령어로 매핑"""
-        # Python 서비스 ID -> 아두이노 명령 매핑
-        mapping = {
-            1: '1',  # 우산 -> 1번 액추에이터 (우산)
-            2: '4',  # 선크림 -> 4번 액추에이터 (선글라스+선크림)
-            3: '4',  # 선글라스 -> 4번 액추에이터 (선글라스+선크림)
-            4: '3',  # 마스크 -> 3번 액추에이터 (마스크)
-            5: '2'   # 외투(추위) -> 2번 액추에이터 (핫팩)
-        }
-        
-        # 중복 제거하면서 아두이노 명령 생성
-        arduino_ids = set()
-        for python_id in needed_ids:
-            if python_id in mapping:
-                arduino_ids.add(mapping[python_id])
-            else:
-                print(f"알 수 없는 액추에이터 ID: {python_id}")
-        
-        # 정렬된 문자열로 반환 (예: "13", "24" 등)
-        command = ''.join(sorted(arduino_ids))
-        return command if command else "0"
+            log.debug("내릴 액추에이터가 없습니다.")
 
-    async def send_command(self, command):
-        """아두이노로 명령 전송"""
+    async def publish_state(self):
+        """올라가 있는 액추에이터와 보충이 필요한 슬롯을 ACTUATOR_STATE 로 발행"""
+        ACTIVE.set(len(self.active))
+        RESTOCK.set(len(self.restock))
+        await self.event_bus.emit(Event(EventType.ACTUATOR_STATE, {
+            'active': sorted(self.active),
+            'restock': sorted(slot + 1 for slot in self.restock),
+            'timestamp': datetime.now()
+        }))
+
+    async def handle_shelf(self, event):
+        """보관함 분석 결과 반영 - 빈 슬롯은 보충 대상으로 기록"""
+        analysis = event.detail['analysis']
+        self.slot_states = {verdict.slot: verdict for verdict in analysis.verdicts}
+        self.restock = set(analysis.empty_slots())
+        if self.restock:
+            log.info("보충 필요 슬롯", slots=sorted(slot + 1 for slot in self.restock))
+        await self.publish_state()
+
+    async def handle_slot(self, event):
+        """스트리밍 중 먼저 결정된 슬롯 판정을 바로 반영"""
+        verdict = event.detail['verdict']
+        self.slot_states[verdict.slot] = verdict
+        if verdict.occupied:
+            self.restock.discard(verdict.slot)
+        else:
+            self.restock.add(verdict.slot)
+
+    def skip_empty_slots(self, command):
+        """마지막 분석에서 비어 있던 슬롯의 액추에이터는 명령에서 제외"""
+        if not self.slot_of or not self.slot_states or command == "0":
+            return command
+        kept = []
+        for actuator_id in command:
+            verdict = self.slot_states.get(self.slot_of.get(actuator_id))
+            if verdict is not None and not verdict.occupied:
+                log.info("빈 슬롯의 액추에이터 생략", slot=verdict.slot + 1, actuator=actuator_id)
+                continue
+            kept.append(actuator_id)
+        return ''.join(kept)
+
+    def read_response(self, command):
+        """스케치의 'Received: <명령>' 수신 확인 줄까지 읽음 (SERIAL_TIMEOUT 안에 오지 않으면 빈 문자열)
+
+        그 사이의 다른 줄(이전 명령의 'Action completed' 등)은 건너뜀
+        """
+        expected = f"Received: {command}"
+        deadline = time.monotonic() + self.settings.SERIAL_TIMEOUT
+        while time.monotonic() < deadline:
+            line = self.serial.readline().decode('utf-8', errors='ignore').rstrip()
+            if line == expected:
+                return line
+            if line:
+                log.debug("아두이노 출력", line=line, every=1)
+        return ''
+
+    async def send_command(self, command, wait=True):
+        """아두이노로 명령 전송 (wait=True 면 액추에이터 작동 시간만큼 대기)"""
         if not self.serial or not self.serial.is_open:
-            print("시리얼 연결이 없습니다.")
+            log.warning("시리얼 연결이 없습니다.", every=60)
+            COMMANDS.labels('disconnected').inc()
             return
 
         try:
-            # 아두이노 코드가 '\n'으로 명령의 끝을 인식
-            full_command = f"{command}\n"
-            self.serial.write(full_command.encode())
-            print(f"아두이노로 명령 전송: '{command}'")
-            
-            # 아두이노 응답 확인 (선택사항)
-            await asyncio.sleep(0.1)
-            if self.serial.in_waiting > 0:
-                response = self.serial.readline().decode('utf-8').rstrip()
-                print(f"아두이노 응답: {response}")
-            
+            async with self.serial_lock:
+                # 이전 명령의 남은 출력은 버리고 이번 명령의 수신 확인만 측정
+                self.serial.reset_input_buffer()
+                # 아두이노 코드가 '\n'으로 명령의 끝을 인식
+                full_command = f"{command}\n"
+                sent = time.perf_counter()
+                self.serial.write(full_command.encode())
+                log.debug("아두이노로 명령 전송", command=command)
+
+                # 수신 확인 줄을 시리얼 타임아웃까지 기다려 도착 시점에 왕복 시간 기록
+                response = await asyncio.get_running_loop().run_in_executor(None, self.read_response, command)
+            if response:
+                ROUND_TRIP.observe(time.perf_counter() - sent)
+                log.debug("아두이노 응답", response=response, every=1)
+                COMMANDS.labels('ok').inc()
+            else:
+                log.warning("아두이노 응답 없음", command=command, every=60)
+                COMMANDS.labels('no_response').inc()
+
             # 액추에이터 작동 시간 대기
-            await asyncio.sleep(self.settings.ACTUATOR_OPERATION_TIME)
+            if wait:
+                await asyncio.sleep(self.settings.ACTUATOR_OPERATION_TIME)
             
         except Exception as e:
-            print(f"시리얼 명령 전송 오류: {e}")
+            log.error("시리얼 명령 전송 오류", error=e, every=5)
+            COMMANDS.labels('error').inc()
 
     async def stop(self):
         """액추에이터 컨트롤러 종료"""
         if self.active:
-            print("종료 전 모든 액추에이터 내리기")
+            log.info("종료 전 모든 액추에이터 내리기")
             await self.send_command("6")
             self.active.clear()
             
         if self.serial and self.serial.is_open:
-            await self.send_command("0")  # 모든 액추에이터 정지
+            await self.send_command("0", wait=False)  # 모든 액추에이터 정지
             self.serial.close()
-            print("시리얼 연결 종료")
+            log.info("시리얼 연결 종료")
 
     def __del__(self):
         """소멸자에서 시리얼 포트 정리"""
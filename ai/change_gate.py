@@ -0,0 +1,43 @@
+import cv2
+import numpy as np
+
+class FrameChangeGate:
+    """마지막으로 분석한 프레임과 비교해 보관함에 변화가 없으면 분석을 건너뛰는 게이트"""
+
+    def __init__(self, rows=2, cols=3, cell_pixels=8, threshold=12.0):
+        self.rows = rows
+        self.cols = cols
+        self.cell_pixels = cell_pixels
+        # 셀 평균 절대 차이 임계값 (0-255 밝기 단위)
+        self.threshold = threshold
+
+        self.last_signature = None
+        self.last_result = None
+
+    def signature(self, frame):
+        """셀마다 cell_pixels x cell_pixels 로 축소한 밝기 정규화 흑백 썸네일"""
+        gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        size = (self.cols * self.cell_pixels, self.rows * self.cell_pixels)
+        small = cv2.resize(gray, size, interpolation=cv2.INTER_AREA).astype(np.float32)
+        # 전체 밝기 변화(노출, 조명)는 변화로 보지 않도록 평균을 맞춤
+        return small - small.mean() + 128.0
+
+    def cell_differences(self, signature):
+        """셀별 평균 절대 차이 (rows x cols)"""
+        diff = np.abs(signature - self.last_signature)
+        p = self.cell_pixels
+        return diff.reshape(self.rows, p, self.cols, p).mean(axis=(1, 3))
+
+    def check(self, frame):
+        """(변화 여부, 셀별 차이, 시그니처) 반환 - 이전 분석이 없으면 항상 변화로 판단"""
+        signature = self.signature(frame)
+        if self.last_signature is None or self.last_result is None:
+            return True, None, signature
+
+        differences = self.cell_differences(signature)
+        return bool((differences > self.threshold).any()), differences, signature
+
+    def commit(self, signature, result):
+        """분석이 끝난 프레임을 다음 비교 기준으로 저장"""
+        self.last_signature = signature
+        self.last_result = result
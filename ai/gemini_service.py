@@ -1,17 +1,258 @@
+import asyncio
+import time
+from functools import partial
 import google.generativeai as genai
 from config.settings import Settings
 from events.event_types import Event, EventType
+from ai.change_gate import FrameChangeGate
+from ai.slot_classifier import SlotClassifier
+from ai.multi_crop import MOSAIC_PROMPT, PARTS_PROMPT, build_mosaic, build_parts
+from ai.result_cache import AnalysisCache, cache_key, perceptual_hash
+from ai.shelf_result import SHELF_PROMPT, SHELF_SCHEMA, ShelfAnalysis, SlotStreamParser, parse_slot_response
+from camera.frame_encoder import EncodeOptions, FrameEncoder
+from utils import metrics
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+REQUEST_SECONDS = metrics.histogram('gemini_request_seconds', 'Gemini 요청 시간 (결과별)', ('outcome',))
+ANALYSES = metrics.counter('shelf_analyses', '보관함 분석 결과 출처 (gate, local, cache, model)', ('source',))
+CACHE_LOOKUPS = metrics.counter('analysis_cache_lookups', '분석 캐시 조회 (hit, miss)', ('result',))
 
 class GeminiService:
     def __init__(self, event_bus, settings: Settings):
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel('gemini-pro-vision')
+        # REST 전송에서는 *_async 메서드가 동작하지 않으므로 동기 호출을 스레드에서 실행
+        self.rest = bool(settings.UPSTREAM_SIMULATOR_URL)
+        if self.rest:
+            # 로컬 시뮬레이터는 REST 엔드포인트만 제공
+            genai.configure(
+                api_key=settings.GEMINI_API_KEY or 'simulator',
+                transport='rest',
+                client_options={'api_endpoint': settings.UPSTREAM_SIMULATOR_URL}
+            )
+        else:
+            genai.configure(api_key=settings.GEMINI_API_KEY)
+        self.model_name = settings.GEMINI_MODEL
+        self.model = genai.GenerativeModel(self.model_name)
+        # 슬롯별 점유 여부를 JSON 스키마로 받음
+        self.generation_config = genai.GenerationConfig(
+            response_mime_type='application/json',
+            response_schema=SHELF_SCHEMA
+        )
         self.event_bus = event_bus
+        self.settings = settings
+        # 보관함 내용이 그대로면 이전 분석 결과를 재사용
+        self.change_gate = FrameChangeGate(threshold=settings.CHANGE_GATE_THRESHOLD)
+        # 빈 슬롯 기준값이 있으면 로컬 분류기를 먼저 사용
+        self.classifier = SlotClassifier()
+        if self.classifier.load(settings.SLOT_BASELINE_FILE):
+            log.info("슬롯 기준값 로드", path=settings.SLOT_BASELINE_FILE)
+        self.last_result = None
+        # 같은(거의 같은) 이미지와 프롬프트의 결과는 로컬에서 재사용
+        self.cache = AnalysisCache(
+            max_entries=settings.ANALYSIS_CACHE_SIZE,
+            ttl=settings.ANALYSIS_CACHE_TTL,
+            path=settings.ANALYSIS_CACHE_FILE or None
+        )
+        # 모델 요청용 이미지 전처리
+        self.encoder = FrameEncoder(EncodeOptions(
+            max_side=settings.MODEL_IMAGE_MAX_SIDE,
+            format=settings.MODEL_IMAGE_FORMAT,
+            quality=settings.MODEL_IMAGE_QUALITY,
+            target_bytes=settings.MODEL_IMAGE_TARGET_BYTES or None,
+            grayscale=settings.MODEL_IMAGE_GRAYSCALE
+        ))
+        # 셀 단위 모드에서 각 셀에 적용하는 전처리
+        self.cell_encoder = FrameEncoder(EncodeOptions(
+            max_side=settings.MODEL_CELL_MAX_SIDE,
+            format=settings.MODEL_IMAGE_FORMAT,
+            quality=settings.MODEL_IMAGE_QUALITY,
+            grayscale=settings.MODEL_IMAGE_GRAYSCALE
+        ))
+
+        # 동시 요청 수 제한, 진행 중인 분석
+        self.semaphore = asyncio.Semaphore(settings.GEMINI_MAX_CONCURRENCY)
+        self.pending = None
+
         self.event_bus.subscribe(EventType.GEMINI_RESPONSE, self.handle_analysis)
 
     async def handle_analysis(self, event):
-        path = event.detail['path']
-        img = open(path, 'rb').read()
-        prompt = "Analyze this image"  # From attachment [3]
-        response = self.model.generate_content([prompt, img])
-        # Process response
+        """분석을 별도 태스크로 실행해 이벤트 루프와 이벤트 체인을 막지 않음"""
+        # 새 캡처가 오면 아직 끝나지 않은 이전 분석은 취소
+        if self.pending and not self.pending.done():
+            log.info("새 캡처 도착 - 이전 Gemini 분석 취소")
+            self.pending.cancel()
+        self.pending = asyncio.create_task(self.analyze(event.detail))
+        self.pending.add_done_callback(log_failure)
+
+    async def analyze(self, detail):
+        loop = asyncio.get_running_loop()
+        frame = detail.get('frame')
+        signature = None
+        if frame is not None:
+            changed, differences, signature = await loop.run_in_executor(None, self.change_gate.check, frame)
+            if not changed:
+                log.info("보관함 변화 없음 - 이전 분석 재사용", max_diff=round(float(differences.max()), 1))
+                ANALYSES.labels('gate').inc()
+                await self.publish(self.change_gate.last_result)
+                return
+
+            # 로컬 분류 결과가 충분히 확실하면 Gemini 호출 생략
+            # 기준값은 보정된 셀로 만들었으므로 보정되지 않은 프레임(roi 없음)에는 적용하지 않음
+            verdicts = None
+            if detail.get('roi') is not None:
+                verdicts = await loop.run_in_executor(None, self.classifier.classify, frame)
+            if verdicts and min(v.confidence for v in verdicts) >= self.settings.SLOT_CONFIDENCE_THRESHOLD:
+                log.info("로컬 슬롯 판정", slots=[int(v.occupied) for v in verdicts])
+                analysis = ShelfAnalysis(verdicts, 'local')
+                ANALYSES.labels('local').inc()
+                self.change_gate.commit(signature, analysis)
+                await self.publish(analysis)
+                return
+
+        # 카메라가 이미 인코딩한 캡처, 같은 캡처의 재인코딩 결과를 재사용할 때 쓰는 키
+        image = detail.get('image')
+        capture_key = detail.get('timestamp')
+        # 원본 프레임이 있으면 그대로, 없으면 카메라 버퍼나 파일을 다시 전처리
+        if frame is not None:
+            source = frame
+        elif detail.get('image') is not None:
+            source = detail['image'].data
+        else:
+            source = await loop.run_in_executor(None, read_file, detail['path'])
+        # 셀 단위 모드는 보정된(정면 격자) 프레임이 있어야 사용 가능
+        roi = detail.get('roi')
+        mode = self.settings.GEMINI_ANALYSIS_MODE
+        if mode != 'frame' and (frame is None or roi is None):
+            mode = 'frame'
+        prompt = {'frame': SHELF_PROMPT, 'parts': PARTS_PROMPT, 'mosaic': MOSAIC_PROMPT}[mode]
+
+        image_hash = await loop.run_in_executor(None, perceptual_hash, source)
+        key = cache_key(image_hash, prompt, self.model_name)
+        result = self.cache.get(key)
+        if result is not None:
+            log.info("캐시된 분석 결과 사용")
+            CACHE_LOOKUPS.labels('hit').inc()
+            ANALYSES.labels('cache').inc()
+        else:
+            CACHE_LOOKUPS.labels('miss').inc()
+            # 해상도 제한과 바이트 예산을 넘는 경우에만 요청용으로 다시 인코딩
+            contents = await loop.run_in_executor(None, self.build_contents, mode, source, roi, image, capture_key)
+            result = await self.request(contents)
+            if result is None:
+                return
+            ANALYSES.labels('model').inc()
+
+        verdicts = parse_slot_response(result)
+        if not verdicts:
+            log.warning("Gemini 응답에서 슬롯 판정을 찾지 못함", response=result[:80])
+            return
+        self.cache.put(key, result)
+
+        analysis = ShelfAnalysis(verdicts, 'gemini')
+        if signature is not None:
+            self.change_gate.commit(signature, analysis)
+        await self.publish(analysis)
+
+    def build_contents(self, mode, source, roi, image=None, capture_key=None):
+        """분석 모드별 요청 내용 - 전체 프레임 1장, 셀 여러 장, 또는 셀 모자이크 1장
+
+        capture_key 가 있으면 같은 캡처를 다시 분석할 때 인코딩 결과를 재사용
+        """
+        def key(kind):
+            return (kind, capture_key) if capture_key is not None else None
+
+        if mode == 'parts':
+            return build_parts(roi.cells(source), self.cell_encoder, key=key('parts'))
+        if mode == 'mosaic':
+            mosaic = build_mosaic(roi.cells(source), roi.cols, tile_size=self.settings.MODEL_CELL_MAX_SIDE)
+            return [MOSAIC_PROMPT, self.encoder.encode(mosaic, key=key('mosaic')).as_part()]
+        if image is not None and self.encoder.fits(image):
+            return [SHELF_PROMPT, image.as_part()]
+        return [SHELF_PROMPT, self.encoder.encode(source, key=key('frame')).as_part()]
+
+    async def publish(self, analysis):
+        """슬롯별 분석 결과를 저장하고 SHELF_ANALYZED 이벤트로 전달"""
+        self.last_result = analysis
+        await self.event_bus.emit(Event(EventType.SHELF_ANALYZED, {'analysis': analysis}))
+
+    async def request(self, contents):
+        """동시성 제한과 요청별 제한시간을 적용한 비동기 Gemini 호출"""
+        start = None
+        outcome = 'error'
+        try:
+            async with self.semaphore:
+                # 대기열에서 기다린 시간은 제외하고 요청 시간만 측정
+                start = time.monotonic()
+                generate = self.generate_stream(contents) if self.settings.GEMINI_STREAM else self.generate(contents)
+                text = await asyncio.wait_for(generate, timeout=self.settings.GEMINI_TIMEOUT)
+            outcome = 'ok'
+            return text
+        except asyncio.TimeoutError:
+            outcome = 'timeout'
+            log.warning("Gemini 요청 시간 초과", timeout=self.settings.GEMINI_TIMEOUT)
+        except asyncio.CancelledError:
+            outcome = 'cancelled'
+            raise
+        except Exception as e:
+            log.error("Gemini 요청 오류", error=e)
+        finally:
+            # 세마포어를 얻기 전에 취소되면 요청을 보내지 않았으므로 기록하지 않음
+            if start is not None:
+                elapsed = time.monotonic() - start
+                REQUEST_SECONDS.labels(outcome).observe(elapsed)
+                log.info("Gemini 요청 완료", outcome=outcome, seconds=round(elapsed, 2))
+        return None
+
+    async def generate(self, contents):
+        if self.rest:
+            response = await asyncio.get_running_loop().run_in_executor(
+                None, partial(self.model.generate_content, contents, generation_config=self.generation_config)
+            )
+        else:
+            response = await self.model.generate_content_async(contents, generation_config=self.generation_config)
+        return response.text
+
+    async def stream_chunks(self, contents):
+        """스트리밍 응답 조각 - REST 전송은 동기 이터레이터를 조각마다 스레드에서 읽음"""
+        if not self.rest:
+            response = await self.model.generate_content_async(
+                contents, generation_config=self.generation_config, stream=True
+            )
+            async for chunk in response:
+                yield chunk
+            return
+
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(None, partial(
+            self.model.generate_content, contents, generation_config=self.generation_config, stream=True
+        ))
+        chunks = iter(response)
+        while True:
+            chunk = await loop.run_in_executor(None, next, chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+
+    async def generate_stream(self, contents):
+        """응답 조각이 올 때마다 결정된 슬롯을 바로 SHELF_SLOT_DECIDED 로 발행"""
+        parser = SlotStreamParser()
+        async for chunk in self.stream_chunks(contents):
+            # 마지막/안전 필터 조각처럼 parts 가 없는 조각은 .text 에서 ValueError - 건너뜀
+            try:
+                text = chunk.text
+            except ValueError:
+                log.debug("텍스트 없는 응답 조각 건너뜀")
+                continue
+            for verdict in parser.feed(text):
+                await self.event_bus.emit(Event(EventType.SHELF_SLOT_DECIDED, {'verdict': verdict}))
+        return parser.result()
+
+def log_failure(task):
+    """분석 태스크의 예외를 꺼내 기록 (취소는 정상 흐름)"""
+    if not task.cancelled() and task.exception() is not None:
+        log.error("보관함 분석 실패", error=repr(task.exception()))
+
+def read_file(path):
+    with open(path, 'rb') as f:
+        return f.read()
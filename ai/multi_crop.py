@@ -0,0 +1,44 @@
+import cv2
+import numpy as np
+
+# 셀 이미지를 여러 장 또는 번호가 붙은 모자이크로 보낼 때의 프롬프트
+PARTS_PROMPT = (
+    "Each of the following images is one slot of a box holding items needed for rainy, sunny, cold or dusty weather. "
+    "Each image is preceded by its slot number. For every slot, report whether it contains an item."
+)
+
+MOSAIC_PROMPT = (
+    "This image is a mosaic of the slots of a box holding items needed for rainy, sunny, cold or dusty weather. "
+    "Each tile is one slot and is labeled with its slot number in the top-left corner. "
+    "For every slot, report whether it contains an item."
+)
+
+def build_parts(cells, encoder, key=None):
+    """슬롯 번호 텍스트와 셀 이미지를 번갈아 넣은 요청 내용 (슬롯 번호는 1부터)
+
+    key 를 주면 셀마다 (key, 슬롯 번호) 로 인코딩 결과를 재사용
+    """
+    contents = [PARTS_PROMPT]
+    for index, cell in enumerate(cells):
+        contents.append(f"Slot {index + 1}:")
+        cell_key = (key, index) if key is not None else None
+        contents.append(encoder.encode(np.ascontiguousarray(cell), key=cell_key).as_part())
+    return contents
+
+def build_mosaic(cells, cols, tile_size=160, gap=6):
+    """셀을 같은 크기로 맞추고 경계와 번호를 그린 한 장의 격자 이미지"""
+    rows = (len(cells) + cols - 1) // cols
+    height = rows * tile_size + (rows + 1) * gap
+    width = cols * tile_size + (cols + 1) * gap
+    mosaic = np.full((height, width, 3), 255, dtype=np.uint8)
+
+    for index, cell in enumerate(cells):
+        row, col = divmod(index, cols)
+        y = gap + row * (tile_size + gap)
+        x = gap + col * (tile_size + gap)
+        mosaic[y:y + tile_size, x:x + tile_size] = cv2.resize(cell, (tile_size, tile_size), interpolation=cv2.INTER_AREA)
+        label = str(index + 1)
+        cv2.rectangle(mosaic, (x, y), (x + 28, y + 28), (0, 0, 0), -1)
+        cv2.putText(mosaic, label, (x + 6, y + 22), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+
+    return mosaic
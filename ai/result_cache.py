@@ -0,0 +1,97 @@
+import hashlib
+import io
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from PIL import Image
+
+def perceptual_hash(image):
+    """64비트 difference hash - 거의 같은 이미지는 같은 값이 나옴
+
+    image 는 PIL 이미지, 인코딩된 바이트, 또는 numpy 프레임(BGR) 중 하나
+    """
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        image = Image.open(io.BytesIO(image))
+    elif not isinstance(image, Image.Image):
+        image = Image.fromarray(image[..., ::-1] if image.ndim == 3 else image)
+
+    pixels = list(image.convert('L').resize((9, 8), Image.BILINEAR).getdata())
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+def cache_key(image_hash, prompt, model):
+    prompt_digest = hashlib.sha1(prompt.encode('utf-8')).hexdigest()[:16]
+    return f"{model}:{prompt_digest}:{image_hash:016x}"
+
+class AnalysisCache:
+    """이미지 해시, 프롬프트, 모델 이름을 키로 하는 분석 결과 캐시
+
+    메모리 LRU 가 1차, 선택적인 SQLite 파일이 2차 저장소이며 둘 다 TTL 을 따름
+    """
+
+    def __init__(self, max_entries=256, ttl=24 * 3600, path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # key -> (만료 시각, 값)
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        self.db = None
+        if path:
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, expires REAL, value TEXT)"
+            )
+            self.db.execute("DELETE FROM cache WHERE expires < ?", (time.time(),))
+            self.db.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires >= now:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self.entries[key]
+
+            if self.db is not None:
+                row = self.db.execute(
+                    "SELECT expires, value FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row and row[0] >= now:
+                    value = json.loads(row[1])
+                    self._remember(key, row[0], value)
+                    self.hits += 1
+                    return value
+
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        expires = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, expires, value)
+            if self.db is not None:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO cache (key, expires, value) VALUES (?, ?, ?)",
+                    (key, expires, json.dumps(value, ensure_ascii=False))
+                )
+                self.db.commit()
+
+    def _remember(self, key, expires, value):
+        self.entries[key] = (expires, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
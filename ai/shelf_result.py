@@ -0,0 +1,115 @@
+import json
+import re
+import time
+from dataclasses import dataclass, field, asdict
+from typing import List
+
+# 2x3 보관함 슬롯별 점유 여부를 받기 위한 프롬프트와 응답 스키마
+SHELF_PROMPT = (
+    "This is a box with a 2x3 grid of slots holding items needed for rainy, sunny, cold or dusty weather. "
+    "Slots are numbered 1 to 6 left to right, top row first. "
+    "For every slot, report whether it contains an item."
+)
+
+SHELF_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "slots": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "slot": {"type": "integer"},
+                    "occupied": {"type": "boolean"},
+                    "confidence": {"type": "number"}
+                },
+                "required": ["slot", "occupied"]
+            }
+        }
+    },
+    "required": ["slots"]
+}
+
+@dataclass
+class SlotVerdict:
+    """보관함 슬롯 하나의 판정 결과"""
+    slot: int             # 0부터 시작하는 슬롯 번호 (행 우선)
+    occupied: bool        # 물건이 있으면 True
+    confidence: float     # 0.0 ~ 1.0
+    source: str = 'local' # 'local' 또는 'gemini'
+
+@dataclass
+class ShelfAnalysis:
+    """보관함 전체 분석 결과"""
+    verdicts: List[SlotVerdict]
+    source: str
+    timestamp: float = field(default_factory=time.time)
+
+    def empty_slots(self):
+        return [v.slot for v in self.verdicts if not v.occupied]
+
+    def is_empty(self, slot):
+        """판정되지 않은 슬롯은 비어 있지 않은 것으로 간주"""
+        return any(v.slot == slot and not v.occupied for v in self.verdicts)
+
+    def to_dict(self):
+        return asdict(self)
+
+def parse_slot_response(text, slot_count=6):
+    """Gemini JSON 응답을 SlotVerdict 목록으로 변환 (응답의 슬롯 번호는 1부터 시작)"""
+    # 코드 블록으로 감싸 보내는 경우 제거
+    text = re.sub(r"^```(?:json)?\s*|\s*```$", "", text.strip())
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return []
+
+    verdicts = {}
+    for item in data.get('slots', []) if isinstance(data, dict) else []:
+        try:
+            slot = int(item['slot']) - 1
+        except (KeyError, TypeError, ValueError):
+            continue
+        if 0 <= slot < slot_count:
+            verdicts[slot] = SlotVerdict(
+                slot, bool(item.get('occupied')), float(item.get('confidence', 1.0)), 'gemini'
+            )
+    return [verdicts[slot] for slot in sorted(verdicts)]
+
+class SlotStreamParser:
+    """스트리밍 응답 조각에서 완성된 슬롯 객체를 찾아 판정을 하나씩 반환하는 파서"""
+
+    # 슬롯 객체는 중첩이 없으므로 닫힌 중괄호까지 오면 완성된 것으로 판단
+    OBJECT_PATTERN = re.compile(r'\{[^{}]*"slot"[^{}]*\}')
+
+    def __init__(self, slot_count=6):
+        self.slot_count = slot_count
+        self.buffer = ''
+        self.position = 0
+        self.decided = {}
+
+    def feed(self, chunk):
+        """새 조각을 추가하고 이번에 새로 결정된 SlotVerdict 목록 반환"""
+        self.buffer += chunk
+        verdicts = []
+        for match in self.OBJECT_PATTERN.finditer(self.buffer, self.position):
+            self.position = match.end()
+            try:
+                item = json.loads(match.group(0))
+                slot = int(item['slot']) - 1
+            except (KeyError, TypeError, ValueError):
+                continue
+            if 0 <= slot < self.slot_count and slot not in self.decided:
+                verdict = SlotVerdict(slot, bool(item.get('occupied')), float(item.get('confidence', 1.0)), 'gemini')
+                self.decided[slot] = verdict
+                verdicts.append(verdict)
+        return verdicts
+
+    def result(self):
+        """누적된 응답 텍스트 - 스트림이 중간에 끊겨 JSON 이 불완전하면 지금까지 결정된 슬롯으로 구성"""
+        if not self.decided or parse_slot_response(self.buffer, self.slot_count):
+            return self.buffer
+        return json.dumps({'slots': [
+            {'slot': slot + 1, 'occupied': verdict.occupied, 'confidence': verdict.confidence}
+            for slot, verdict in sorted(self.decided.items())
+        ]})
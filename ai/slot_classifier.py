@@ -0,0 +1,111 @@
+import argparse
+import os
+import cv2
+import numpy as np
+from ai.shelf_result import SlotVerdict
+
+class SlotClassifier:
+    """빈 슬롯 기준값과 비교해 슬롯별 점유 여부를 로컬 CPU에서 판정하는 분류기"""
+
+    # 각 특징이 이 값만큼 변하면 판정 경계(점수 1.0)에 도달
+    EDGE_SCALE = 0.08
+    HIST_SCALE = 0.35
+    PIXEL_SCALE = 0.12
+
+    def __init__(self, rows=2, cols=3, cell_size=32, edge_threshold=30):
+        self.rows = rows
+        self.cols = cols
+        self.cell_size = cell_size
+        self.edge_threshold = edge_threshold
+        # 빈 보관함 기준값 (calibrate_empty 또는 load 로 설정)
+        self.baseline = None
+
+    @property
+    def slot_count(self):
+        return self.rows * self.cols
+
+    def split_cells(self, frame):
+        """한 번의 resize 후 reshape 로 (슬롯, S, S, 채널) 배열 생성"""
+        s = self.cell_size
+        small = cv2.resize(frame, (self.cols * s, self.rows * s), interpolation=cv2.INTER_AREA)
+        hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY).astype(np.float32)
+
+        def to_cells(image):
+            shape = (self.rows, s, self.cols, s) + image.shape[2:]
+            cells = image.reshape(shape).swapaxes(1, 2)
+            return cells.reshape((self.slot_count, s, s) + image.shape[2:])
+
+        return to_cells(gray), to_cells(hsv)
+
+    def extract_features(self, frame):
+        """슬롯별 엣지 밀도, 색상 히스토그램, 흑백 픽셀"""
+        gray, hsv = self.split_cells(frame)
+
+        gx = np.abs(np.diff(gray, axis=2))[:, :-1, :]
+        gy = np.abs(np.diff(gray, axis=1))[:, :, :-1]
+        edge_density = ((gx + gy) > self.edge_threshold).mean(axis=(1, 2))
+
+        # 색상 8구간 x 채도 4구간 히스토그램을 슬롯 오프셋을 더해 한 번의 bincount 로 계산
+        bins = (hsv[..., 0].astype(np.int32) * 8 // 180) * 4 + hsv[..., 1].astype(np.int32) * 4 // 256
+        offsets = (np.arange(self.slot_count) * 32)[:, None, None]
+        counts = np.bincount((bins + offsets).ravel(), minlength=self.slot_count * 32)
+        histograms = counts.reshape(self.slot_count, 32) / float(self.cell_size * self.cell_size)
+
+        return {'edge': edge_density, 'hist': histograms, 'gray': gray}
+
+    def calibrate_empty(self, frame):
+        """빈 보관함 프레임으로 슬롯별 기준값 설정"""
+        self.baseline = self.extract_features(frame)
+
+    def save(self, path):
+        np.savez_compressed(path, **self.baseline)
+
+    def load(self, path):
+        """기준값 파일이 없으면 False 반환"""
+        if not path or not os.path.exists(path):
+            return False
+        with np.load(path) as data:
+            self.baseline = {key: data[key] for key in ('edge', 'hist', 'gray')}
+        return True
+
+    def classify(self, frame):
+        """슬롯별 SlotVerdict 목록 (기준값이 없으면 None)"""
+        if self.baseline is None:
+            return None
+
+        features = self.extract_features(frame)
+        base = self.baseline
+
+        edge_term = np.maximum(features['edge'] - base['edge'], 0) / self.EDGE_SCALE
+        hist_term = (1.0 - np.minimum(features['hist'], base['hist']).sum(axis=1)) / self.HIST_SCALE
+        pixel_term = np.abs(features['gray'] - base['gray']).mean(axis=(1, 2)) / 255.0 / self.PIXEL_SCALE
+
+        score = (edge_term + hist_term + pixel_term) / 3.0
+        probability = 1.0 / (1.0 + np.exp(-4.0 * (score - 1.0)))
+        confidence = np.abs(probability - 0.5) * 2.0
+
+        return [
+            SlotVerdict(slot, bool(probability[slot] >= 0.5), float(confidence[slot]), 'local')
+            for slot in range(self.slot_count)
+        ]
+
+def main():
+    parser = argparse.ArgumentParser(description="빈 보관함 이미지로 슬롯 기준값 저장")
+    parser.add_argument('--empty-image', required=True, help='보정된(정면) 빈 보관함 이미지')
+    parser.add_argument('--save', default='config/slot_baseline.npz', help='기준값 파일 경로')
+    parser.add_argument('--rows', type=int, default=2)
+    parser.add_argument('--cols', type=int, default=3)
+    args = parser.parse_args()
+
+    frame = cv2.imread(args.empty_image)
+    if frame is None:
+        raise SystemExit(f"이미지를 읽을 수 없습니다: {args.empty_image}")
+
+    classifier = SlotClassifier(args.rows, args.cols)
+    classifier.calibrate_empty(frame)
+    classifier.save(args.save)
+    print(f"슬롯 기준값 저장: {args.save}")
+
+if __name__ == "__main__":
+    main()
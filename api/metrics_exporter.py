@@ -0,0 +1,72 @@
+import asyncio
+import json
+import os
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from utils.logger import get_logger
+from utils.metrics import REGISTRY
+
+log = get_logger(__name__)
+
+class MetricsExporter:
+    """지표를 Prometheus 텍스트(/metrics)로 제공하고 주기적으로 JSON 스냅샷 파일에 기록
+
+    HTTP 서버는 별도 스레드에서 동작하므로 이벤트 루프가 막혀 있어도 수집 가능
+    """
+
+    def __init__(self, settings, registry=REGISTRY):
+        self.settings = settings
+        self.registry = registry
+        self.kiosk_id = settings.KIOSK_ID or socket.gethostname()
+        self.server = None
+
+    async def start(self):
+        if self.settings.METRICS_PORT:
+            self.server = ThreadingHTTPServer(
+                (self.settings.METRICS_HOST, self.settings.METRICS_PORT), make_handler(self.registry)
+            )
+            threading.Thread(target=self.server.serve_forever, name='metrics-exporter', daemon=True).start()
+            log.info("지표 수집 주소", url=f"http://{self.settings.METRICS_HOST}:{self.settings.METRICS_PORT}/metrics")
+
+        if not self.settings.METRICS_SNAPSHOT_FILE:
+            return
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.settings.METRICS_SNAPSHOT_INTERVAL)
+            try:
+                await loop.run_in_executor(None, self.write_snapshot)
+            except OSError as e:
+                log.warning("지표 스냅샷 저장 실패", error=e, every=600)
+
+    def write_snapshot(self):
+        """임시 파일에 쓴 뒤 교체 (수집기가 반쯤 쓰인 파일을 읽지 않도록)"""
+        path = self.settings.METRICS_SNAPSHOT_FILE
+        payload = {'kiosk': self.kiosk_id, 'timestamp': time.time(), 'metrics': self.registry.snapshot()}
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+
+def make_handler(registry):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                body, status, content_type = b'not found', 404, 'text/plain'
+            else:
+                body, status, content_type = registry.render().encode('utf-8'), 200, 'text/plain; version=0.0.4; charset=utf-8'
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
@@ -0,0 +1,168 @@
+import asyncio
+import hashlib
+import json
+from datetime import datetime
+from events.event_types import EventType
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+class SnapshotServer:
+    """현재 날씨, 액추에이터 상태, 마지막 보관함 분석을 JSON 으로 제공하는 로컬 HTTP 서버
+
+    - GET /snapshot, /snapshot/<weather|actuators|shelf>: 약한 ETag / If-None-Match 지원 (내용 변화 없으면 304)
+    - GET /events: 상태가 바뀔 때마다 server-sent events 로 전체 스냅샷 전송
+    """
+
+    SECTIONS = ('weather', 'actuators', 'shelf')
+    HEARTBEAT = 15
+    # 요청 줄과 헤더를 다 받을 때까지의 제한 시간 (연결만 하고 보내지 않는 클라이언트 정리)
+    REQUEST_TIMEOUT = 10
+
+    def __init__(self, event_bus, settings):
+        self.event_bus = event_bus
+        self.settings = settings
+        self.state = {section: None for section in self.SECTIONS}
+        self.version = 0
+        # 경로 -> (ETag, 직렬화된 본문) - 상태가 바뀔 때만 다시 계산
+        self.bodies = {}
+        self.clients = set()
+        self.server = None
+
+        self.event_bus.subscribe(EventType.WEATHER_SNAPSHOT, self.on_weather)
+        self.event_bus.subscribe(EventType.ACTUATOR_STATE, self.on_actuators)
+        self.event_bus.subscribe(EventType.SHELF_ANALYZED, self.on_shelf)
+
+    async def on_weather(self, event):
+        if 'data' in event.detail:
+            self.update('weather', {'data': event.detail['data'], 'timestamp': event.detail['timestamp']})
+
+    async def on_actuators(self, event):
+        self.update('actuators', event.detail)
+
+    async def on_shelf(self, event):
+        self.update('shelf', event.detail['analysis'].to_dict())
+
+    def update(self, section, value):
+        """상태 갱신 후 캐시된 본문을 버리고 SSE 구독자에게 알림"""
+        self.state[section] = value
+        self.version += 1
+        self.bodies.clear()
+
+        _, body = self.body('/snapshot')
+        message = f"id: {self.version}\nevent: snapshot\ndata: {body.decode('utf-8')}\n\n".encode('utf-8')
+        for queue in self.clients:
+            if queue.full():
+                # 느린 클라이언트는 오래된 메시지를 버리고 최신 상태만 받음
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+    def body(self, path):
+        cached = self.bodies.get(path)
+        if cached is None:
+            if path == '/snapshot':
+                payload = dict(self.state, version=self.version)
+                content = {section: without_timestamp(value) for section, value in self.state.items()}
+            else:
+                payload = self.state[path.rsplit('/', 1)[1]]
+                content = without_timestamp(payload)
+            body = json.dumps(payload, ensure_ascii=False, default=to_json).encode('utf-8')
+            # 내용만으로 계산한 약한 ETag - 본문 바이트(버전, 갱신 시각)는 달라도 의미가 같으면 304
+            content_body = json.dumps(content, ensure_ascii=False, default=to_json, sort_keys=True).encode('utf-8')
+            etag = 'W/"' + hashlib.sha1(content_body).hexdigest()[:16] + '"'
+            cached = self.bodies[path] = (etag, body)
+        return cached
+
+    async def start(self):
+        self.server = await asyncio.start_server(
+            self.handle_client, self.settings.SNAPSHOT_API_HOST, self.settings.SNAPSHOT_API_PORT
+        )
+        log.info("스냅샷 API 시작됨", url=f"http://{self.settings.SNAPSHOT_API_HOST}:{self.settings.SNAPSHOT_API_PORT}/snapshot")
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def handle_client(self, reader, writer):
+        try:
+            try:
+                request_line, headers = await asyncio.wait_for(read_request(reader), timeout=self.REQUEST_TIMEOUT)
+            except asyncio.TimeoutError:
+                log.debug("요청 수신 시간 초과 - 연결 종료", every=60)
+                return
+
+            parts = request_line.decode('latin-1').split()
+            if len(parts) < 2 or parts[0] != 'GET':
+                await self.respond(writer, 405, b'')
+                return
+
+            path = parts[1].split('?', 1)[0].rstrip('/')
+            if path == '/events':
+                await self.stream_events(writer)
+                return
+            if path != '/snapshot' and path not in {f'/snapshot/{s}' for s in self.SECTIONS}:
+                await self.respond(writer, 404, b'')
+                return
+
+            etag, body = self.body(path)
+            # If-None-Match 는 약한 비교 (W/ 접두사 무시)
+            if etag[2:] in (tag.strip().removeprefix('W/') for tag in headers.get('if-none-match', '').split(',')):
+                await self.respond(writer, 304, b'', {'ETag': etag})
+            else:
+                await self.respond(writer, 200, body, {'ETag': etag, 'Content-Type': 'application/json; charset=utf-8'})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, body, headers=None):
+        reason = {200: 'OK', 304: 'Not Modified', 404: 'Not Found', 405: 'Method Not Allowed'}[status]
+        lines = [f"HTTP/1.1 {status} {reason}", f"Content-Length: {len(body)}",
+                 "Cache-Control: no-cache", "Connection: close"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+    async def stream_events(self, writer):
+        """연결 즉시 현재 스냅샷을 보내고 이후 변경마다 전송"""
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                     b"Cache-Control: no-cache\r\nConnection: keep-alive\r\n\r\n")
+        _, body = self.body('/snapshot')
+        writer.write(f"id: {self.version}\nevent: snapshot\ndata: {body.decode('utf-8')}\n\n".encode('utf-8'))
+        await writer.drain()
+
+        queue = asyncio.Queue(maxsize=4)
+        self.clients.add(queue)
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=self.HEARTBEAT)
+                except asyncio.TimeoutError:
+                    # 프록시/클라이언트 연결 유지를 위한 주석 줄
+                    message = b": keep-alive\n\n"
+                writer.write(message)
+                await writer.drain()
+        finally:
+            self.clients.discard(queue)
+
+async def read_request(reader):
+    """요청 줄과 헤더 dict (헤더 이름은 소문자)"""
+    request_line = await reader.readline()
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    return request_line, headers
+
+def without_timestamp(value):
+    if isinstance(value, dict):
+        return {key: item for key, item in value.items() if key != 'timestamp'}
+    return value
+
+def to_json(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, set):
+        return sorted(value)
+    raise TypeError(f"JSON 으로 변환할 수 없는 값: {type(value).__name__}")
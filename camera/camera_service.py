@@ -1,18 +1,103 @@
-import cv2
-from datetime import datetime
+import asyncio
 from events.event_types import Event, EventType
+from camera.frame_grabber import FrameGrabber
+from camera.frame_encoder import encode_frame
+from camera.capture_store import CaptureStore
+from camera.shelf_roi import ShelfROI
+from utils import metrics
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+CAPTURES = metrics.counter('camera_captures', '캡처 요청 결과 (ok, no_frame)', ('result',))
+FRAME_WAIT = metrics.histogram('camera_frame_wait_seconds', '캡처 요청부터 최신 프레임을 받기까지 시간')
+PROCESS_SECONDS = metrics.histogram('camera_process_seconds', '보관함 보정과 인코딩 시간')
+ENCODED_BYTES = metrics.histogram('camera_encoded_bytes', '인코딩된 캡처 크기',
+                                  buckets=(8 << 10, 16 << 10, 32 << 10, 64 << 10, 128 << 10, 256 << 10, 512 << 10))
 
 class CameraService:
     def __init__(self, event_bus, settings):
         self.event_bus = event_bus
         self.settings = settings
+
+        # 장치를 열어둔 채 최신 프레임을 유지하는 캡처 워커
+        self.grabber = FrameGrabber(
+            settings.CAMERA_PORT,
+            buffer_size=settings.CAMERA_BUFFER_SIZE,
+            idle_timeout=settings.CAMERA_IDLE_TIMEOUT,
+            warmup_frames=settings.CAMERA_WARMUP_FRAMES
+        )
+        self.grabber.start()
+
+        # 디스크 보관은 선택 사항 - 디렉토리가 설정된 경우에만 사용
+        self.store = None
+        if settings.CAMERA_ARCHIVE_DIR:
+            self.store = CaptureStore(
+                settings.CAMERA_ARCHIVE_DIR,
+                max_count=settings.CAMERA_ARCHIVE_MAX_COUNT,
+                max_bytes=settings.CAMERA_ARCHIVE_MAX_BYTES,
+                max_age=settings.CAMERA_ARCHIVE_MAX_AGE,
+                thumbnail_width=settings.CAMERA_ARCHIVE_THUMBNAIL_WIDTH
+            )
+
+        # 보정 파일이 있으면 보관함 영역만 잘라 정면 격자 이미지로 변환
+        self.roi = ShelfROI.load(settings.SHELF_CALIBRATION_FILE)
+        if self.roi:
+            log.info("보관함 보정 로드", grid=f"{self.roi.rows}x{self.roi.cols}", output=self.roi.output_size)
+
         self.event_bus.subscribe(EventType.CAMERA_CAPTURE, self.handle_capture)
+        # 사람이 오면 미리 카메라를 깨워 노출을 안정시킴
+        self.event_bus.subscribe(EventType.HUMAN_COME, self.handle_human_come)
+        self.event_bus.subscribe(EventType.HUMAN_OUT, self.handle_human_out)
+
+    async def warm_up(self):
+        """시작 시 장치를 미리 열어 노출을 안정시킴 (캡처 스레드에서 진행, 기다리지 않음)"""
+        self.grabber.touch()
+
+    async def handle_human_come(self, event):
+        self.grabber.set_active(True)
+
+    async def handle_human_out(self, event):
+        self.grabber.set_active(False)
 
     async def handle_capture(self, event):
-        cap = cv2.VideoCapture(self.settings.CAMERA_PORT)
-        ret, frame = cap.read()
-        if ret:
-            path = f"capture_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
-            cv2.imwrite(path, frame)
-            await self.event_bus.emit(Event(EventType.GEMINI_RESPONSE, {'path': path}))
-        cap.release()
+        loop = asyncio.get_running_loop()
+        # 장치가 닫혀 있으면 첫 프레임까지 기다려야 하므로 이벤트 루프 밖에서 대기
+        with FRAME_WAIT.time():
+            latest = await loop.run_in_executor(None, self.grabber.latest, self.settings.CAMERA_FRAME_TIMEOUT)
+        if latest is None:
+            log.warning("카메라 프레임을 가져오지 못했습니다.")
+            CAPTURES.labels('no_frame').inc()
+            return
+
+        timestamp, frame = latest
+        # 보정/인코딩은 CPU 작업이므로 이벤트 루프 밖에서 실행
+        with PROCESS_SECONDS.time():
+            frame, image, rectified = await loop.run_in_executor(None, self.process_frame, frame)
+        CAPTURES.labels('ok').inc()
+        ENCODED_BYTES.observe(len(image.data))
+
+        # 보정된 프레임에만 셀 격자(roi)를 붙임 - 없으면 분석은 전체 프레임 모드로 진행
+        detail = {'image': image, 'frame': frame, 'timestamp': timestamp, 'roi': self.roi if rectified else None}
+
+        # 디스크 저장은 선택적인 보관용 싱크
+        if self.store:
+            detail['path'] = await loop.run_in_executor(None, self.store.save, image, frame, timestamp)
+
+        await self.event_bus.emit(Event(EventType.GEMINI_RESPONSE, detail))
+
+    def process_frame(self, frame):
+        """보관함 영역 보정 후 메모리 버퍼로 인코딩 -> (프레임, 인코딩 결과, 보정 여부)"""
+        rectified = False
+        if self.roi:
+            height, width = frame.shape[:2]
+            if (width, height) == self.roi.frame_size:
+                frame = self.roi.rectify(frame)
+                rectified = True
+            else:
+                log.warning("보정 해상도 불일치", frame=(width, height), calibration=self.roi.frame_size, every=60)
+        image = encode_frame(frame, self.settings.CAMERA_ENCODE_FORMAT, self.settings.CAMERA_ENCODE_QUALITY)
+        return frame, image, rectified
+
+    def stop(self):
+        self.grabber.stop()
@@ -0,0 +1,153 @@
+import bisect
+import json
+import os
+import threading
+import time
+from datetime import datetime
+import cv2
+from camera.frame_encoder import encode_frame
+
+class CaptureStore:
+    """개수/용량/보존기간 제한이 있는 캡처 보관소"""
+
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, directory, max_count=500, max_bytes=200 * 1024 * 1024,
+                 max_age=7 * 24 * 3600, thumbnail_width=0):
+        self.directory = directory
+        self.max_count = max_count
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.thumbnail_width = thumbnail_width
+
+        self._lock = threading.Lock()
+        # 시간순 정렬된 인덱스 - timestamps는 bisect 검색용 병렬 리스트
+        self.entries = []
+        self.timestamps = []
+        self.total_bytes = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        self.load_index()
+
+    def load_index(self):
+        """인덱스 파일 로드 (없으면 디렉토리를 한 번만 스캔해 재구성)"""
+        index_path = os.path.join(self.directory, self.INDEX_FILE)
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            entries = self.rebuild_index()
+
+        entries.sort(key=lambda e: e['timestamp'])
+        self.entries = entries
+        self.timestamps = [e['timestamp'] for e in entries]
+        self.total_bytes = sum(e['size'] for e in entries)
+
+    def rebuild_index(self):
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            names = set(files)
+            for name in files:
+                stem, _ = os.path.splitext(name)
+                # 썸네일은 캡처 항목의 일부로만 기록 (별도 항목이면 개수 제한이 두 배로 계산됨)
+                if not name.startswith('capture_') or stem.endswith('_thumb'):
+                    continue
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                size = stat.st_size
+                thumbnail = None
+                if stem + '_thumb.jpg' in names:
+                    thumb_path = os.path.join(root, stem + '_thumb.jpg')
+                    thumbnail = os.path.relpath(thumb_path, self.directory)
+                    size += os.path.getsize(thumb_path)
+                entries.append({
+                    'timestamp': stat.st_mtime,
+                    'path': os.path.relpath(path, self.directory),
+                    'size': size,
+                    'thumbnail': thumbnail
+                })
+        return entries
+
+    def save_index(self):
+        index_path = os.path.join(self.directory, self.INDEX_FILE)
+        tmp_path = index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, index_path)
+
+    def save(self, image, frame=None, timestamp=None):
+        """인코딩된 캡처를 저장하고 제한을 넘는 오래된 항목 정리"""
+        timestamp = timestamp or time.time()
+        when = datetime.fromtimestamp(timestamp)
+
+        # 날짜별 하위 디렉토리로 나눠 한 디렉토리의 파일 수를 제한
+        day_dir = when.strftime('%Y%m%d')
+        os.makedirs(os.path.join(self.directory, day_dir), exist_ok=True)
+        stem = f"capture_{when.strftime('%H%M%S')}_{int(timestamp * 1000) % 1000:03d}"
+        rel_path = os.path.join(day_dir, stem + image.extension)
+        with open(os.path.join(self.directory, rel_path), 'wb') as f:
+            f.write(image.data)
+        size = len(image.data)
+
+        thumb_path = None
+        if self.thumbnail_width and frame is not None:
+            thumb_path = os.path.join(day_dir, stem + '_thumb.jpg')
+            height, width = frame.shape[:2]
+            thumb_height = max(1, height * self.thumbnail_width // width)
+            thumb = cv2.resize(frame, (self.thumbnail_width, thumb_height), interpolation=cv2.INTER_AREA)
+            encoded = encode_frame(thumb, 'jpeg', 70)
+            with open(os.path.join(self.directory, thumb_path), 'wb') as f:
+                f.write(encoded.data)
+            size += len(encoded.data)
+
+        entry = {'timestamp': timestamp, 'path': rel_path, 'size': size, 'thumbnail': thumb_path}
+        with self._lock:
+            pos = bisect.bisect_right(self.timestamps, timestamp)
+            self.timestamps.insert(pos, timestamp)
+            self.entries.insert(pos, entry)
+            self.total_bytes += size
+            self.enforce_limits()
+            self.save_index()
+
+        return os.path.join(self.directory, rel_path)
+
+    def enforce_limits(self):
+        """개수, 용량, 보존기간 제한을 넘는 오래된 캡처 삭제 (잠금 보유 상태에서 호출)"""
+        cutoff = time.time() - self.max_age if self.max_age else None
+        while self.entries and (
+            (self.max_count and len(self.entries) > self.max_count) or
+            (self.max_bytes and self.total_bytes > self.max_bytes) or
+            (cutoff is not None and self.entries[0]['timestamp'] < cutoff)
+        ):
+            entry = self.entries.pop(0)
+            self.timestamps.pop(0)
+            self.total_bytes -= entry['size']
+            for rel_path in (entry['path'], entry['thumbnail']):
+                if not rel_path:
+                    continue
+                try:
+                    os.remove(os.path.join(self.directory, rel_path))
+                except OSError:
+                    pass
+            # 마지막 캡처가 지워진 날짜 디렉토리 정리 (비어 있지 않으면 rmdir 가 실패하므로 그대로 둠)
+            day_dir = os.path.dirname(entry['path'])
+            if day_dir:
+                try:
+                    os.rmdir(os.path.join(self.directory, day_dir))
+                except OSError:
+                    pass
+
+    def find(self, timestamp):
+        """주어진 시각 이전의 가장 최근 캡처 경로"""
+        with self._lock:
+            pos = bisect.bisect_right(self.timestamps, timestamp)
+            if pos == 0:
+                return None
+            return os.path.join(self.directory, self.entries[pos - 1]['path'])
+
+    def range(self, start, end):
+        """[start, end] 구간의 캡처 인덱스 항목 목록"""
+        with self._lock:
+            lo = bisect.bisect_left(self.timestamps, start)
+            hi = bisect.bisect_right(self.timestamps, end)
+            return list(self.entries[lo:hi])
@@ -0,0 +1,139 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+import cv2
+import numpy as np
+
+# 포맷 이름 -> (확장자, MIME 타입, 품질 파라미터)
+FORMATS = {
+    'jpeg': ('.jpg', 'image/jpeg', cv2.IMWRITE_JPEG_QUALITY),
+    'webp': ('.webp', 'image/webp', cv2.IMWRITE_WEBP_QUALITY),
+    'png': ('.png', 'image/png', cv2.IMWRITE_PNG_COMPRESSION),
+}
+
+@dataclass
+class EncodedFrame:
+    data: bytes
+    mime_type: str
+    extension: str
+    width: int
+    height: int
+    quality: Optional[int] = None
+
+    def as_part(self):
+        """Gemini 요청에 바로 넣을 수 있는 inline 이미지 파트"""
+        return {'mime_type': self.mime_type, 'data': self.data}
+
+def normalize_format(fmt):
+    fmt = fmt.lower()
+    if fmt == 'jpg':
+        fmt = 'jpeg'
+    if fmt not in FORMATS:
+        raise ValueError(f"지원하지 않는 인코딩 포맷: {fmt}")
+    return fmt
+
+def encode_frame(frame, fmt='jpeg', quality=85):
+    """프레임을 디스크를 거치지 않고 메모리 버퍼로 인코딩"""
+    fmt = normalize_format(fmt)
+    extension, mime_type, quality_flag = FORMATS[fmt]
+    if fmt == 'png':
+        # PNG는 품질 대신 압축 레벨(0-9)을 사용
+        params = [quality_flag, max(0, min(9, (100 - quality) // 10))]
+    else:
+        params = [quality_flag, max(1, min(100, quality))]
+
+    ok, buffer = cv2.imencode(extension, frame, params)
+    if not ok:
+        raise RuntimeError(f"프레임 인코딩 실패: {fmt}")
+
+    height, width = frame.shape[:2]
+    return EncodedFrame(buffer.tobytes(), mime_type, extension, width, height, None if fmt == 'png' else quality)
+
+@dataclass(frozen=True)
+class EncodeOptions:
+    max_side: int = 512              # 긴 변 최대 길이 (0이면 리사이즈 안 함)
+    format: str = 'jpeg'             # jpeg, webp, png
+    quality: int = 85                # 시작 품질 (PNG는 무시)
+    target_bytes: Optional[int] = None  # 바이트 예산 - 넘으면 품질을 낮춰 다시 인코딩
+    min_quality: int = 40
+    grayscale: bool = False
+
+class FrameEncoder:
+    """모델 요청용 전처리 - 해상도 제한, 포맷/품질 선택, 바이트 예산, 결과 재사용"""
+
+    def __init__(self, options=None, cache_size=32):
+        self.options = options or EncodeOptions()
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+
+    def encode(self, image, key=None, options=None):
+        """image 는 numpy 프레임(BGR) 또는 인코딩된 바이트
+
+        key 를 주면 같은 key 와 옵션의 인코딩 결과를 다시 쓰지 않고 재사용
+        """
+        options = options or self.options
+        cache_key = (key, options) if key is not None else None
+        if cache_key is not None:
+            with self._lock:
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    self._cache.move_to_end(cache_key)
+                    return cached
+
+        encoded = preprocess_frame(to_frame(image), options)
+
+        if cache_key is not None:
+            with self._lock:
+                self._cache[cache_key] = encoded
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return encoded
+
+    def fits(self, encoded, options=None):
+        """이미 인코딩된 프레임이 포맷, 해상도, 바이트 예산을 만족해 그대로 쓸 수 있는지"""
+        options = options or self.options
+        return (encoded.mime_type == FORMATS[normalize_format(options.format)][1] and not options.grayscale
+                and (not options.max_side or max(encoded.width, encoded.height) <= options.max_side)
+                and (not options.target_bytes or len(encoded.data) <= options.target_bytes))
+
+def to_frame(image):
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        frame = cv2.imdecode(np.frombuffer(image, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            raise ValueError("이미지 디코딩 실패")
+        return frame
+    return image
+
+def resize_long_side(frame, max_side):
+    height, width = frame.shape[:2]
+    if not max_side or max(width, height) <= max_side:
+        return frame
+    scale = max_side / max(width, height)
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+def preprocess_frame(frame, options):
+    fmt = normalize_format(options.format)
+    frame = resize_long_side(frame, options.max_side)
+    if options.grayscale and frame.ndim == 3:
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    frame = np.ascontiguousarray(frame)
+
+    encoded = encode_frame(frame, fmt, options.quality)
+    if fmt == 'png' or not options.target_bytes or len(encoded.data) <= options.target_bytes:
+        return encoded
+
+    # 예산 안에 들어가는 가장 높은 품질을 이진 탐색
+    low, high = options.min_quality, options.quality - 1
+    best = None
+    while low <= high:
+        mid = (low + high) // 2
+        candidate = encode_frame(frame, fmt, mid)
+        if len(candidate.data) <= options.target_bytes:
+            best = candidate
+            low = mid + 1
+        else:
+            high = mid - 1
+    return best or encode_frame(frame, fmt, options.min_quality)
@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import deque
+import cv2
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+class FrameGrabber:
+    """카메라 장치를 열어둔 채 최근 프레임을 링 버퍼에 유지하는 캡처 워커"""
+
+    def __init__(self, camera_port, buffer_size=4, idle_timeout=30.0, warmup_frames=5):
+        self.camera_port = camera_port
+        self.idle_timeout = idle_timeout
+        self.warmup_frames = warmup_frames
+
+        # (timestamp, frame) 링 버퍼 - 가장 오른쪽이 최신 프레임
+        self.frames = deque(maxlen=buffer_size)
+        self._cond = threading.Condition()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+        # 사람이 있는 동안에는 유휴 상태로 들어가지 않음
+        self.active = False
+        self.last_activity = 0.0
+        self.is_open = False
+
+    def start(self):
+        """캡처 스레드 시작 (장치는 깨어날 때까지 열지 않음)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="frame-grabber", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """캡처 스레드 종료 및 장치 해제"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def set_active(self, active):
+        """사람 감지 상태 반영 - 떠난 시점부터 유휴 타이머가 시작됨"""
+        self.active = active
+        self.touch()
+
+    def touch(self):
+        """활동 시각 갱신 후 워커 깨우기"""
+        self.last_activity = time.monotonic()
+        self._wake.set()
+
+    def latest(self, timeout=3.0):
+        """가장 최신 프레임 반환 (장치가 닫혀 있으면 첫 프레임까지 대기)"""
+        self.touch()
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while not self.frames:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            return self.frames[-1]
+
+    def _is_idle(self):
+        return not self.active and time.monotonic() - self.last_activity > self.idle_timeout
+
+    def _run(self):
+        while not self._stop.is_set():
+            # 깨울 때까지 장치를 닫아둔 채 대기
+            self._wake.wait()
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            if self._is_idle():
+                continue
+            self._capture_loop()
+
+    def _capture_loop(self):
+        cap = cv2.VideoCapture(self.camera_port)
+        if not cap.isOpened():
+            log.error("카메라 장치 열기 실패", port=self.camera_port, every=60)
+            cap.release()
+            return
+
+        self.is_open = True
+        log.info("카메라 캡처 워커 활성화")
+        try:
+            # 자동 노출이 안정될 때까지 초기 프레임 버림
+            for _ in range(self.warmup_frames):
+                cap.grab()
+
+            while not self._stop.is_set() and not self._is_idle():
+                ret, frame = cap.read()
+                if not ret:
+                    time.sleep(0.05)
+                    continue
+                with self._cond:
+                    self.frames.append((time.time(), frame))
+                    self._cond.notify_all()
+        finally:
+            cap.release()
+            self.is_open = False
+            with self._cond:
+                self.frames.clear()
+            log.info("카메라 캡처 워커 유휴 상태 전환")
@@ -0,0 +1,120 @@
+import argparse
+import json
+import os
+import cv2
+import numpy as np
+
+class ShelfROI:
+    """보관함 모서리 보정값과 미리 계산된 remap 테이블로 2x3 격자 이미지를 만드는 변환기"""
+
+    def __init__(self, corners, frame_size, output_size=(600, 400), rows=2, cols=3):
+        # corners: 좌상, 우상, 우하, 좌하 순서의 원본 프레임 좌표
+        self.corners = [tuple(map(float, point)) for point in corners]
+        self.frame_size = tuple(frame_size)
+        self.output_size = tuple(output_size)
+        self.rows = rows
+        self.cols = cols
+
+        self.map1, self.map2 = self.build_maps()
+        self.cell_boxes = self.build_cell_boxes()
+
+    def build_maps(self):
+        """출력 픽셀마다 원본 좌표를 한 번만 계산해 고정소수점 remap 테이블로 변환"""
+        out_w, out_h = self.output_size
+        src = np.array(self.corners, dtype=np.float32)
+        dst = np.array([[0, 0], [out_w - 1, 0], [out_w - 1, out_h - 1], [0, out_h - 1]], dtype=np.float32)
+        # 출력 -> 원본 방향 호모그래피
+        homography = cv2.getPerspectiveTransform(dst, src)
+
+        xs, ys = np.meshgrid(np.arange(out_w, dtype=np.float32), np.arange(out_h, dtype=np.float32))
+        points = np.stack([xs, ys, np.ones_like(xs)], axis=-1) @ homography.T.astype(np.float32)
+        map_x = points[..., 0] / points[..., 2]
+        map_y = points[..., 1] / points[..., 2]
+
+        return cv2.convertMaps(map_x, map_y, cv2.CV_16SC2)
+
+    def build_cell_boxes(self):
+        """슬롯 번호 순서(행 우선)의 (x0, y0, x1, y1) 셀 영역"""
+        out_w, out_h = self.output_size
+        boxes = []
+        for index in range(self.rows * self.cols):
+            row, col = divmod(index, self.cols)
+            boxes.append((
+                col * out_w // self.cols, row * out_h // self.rows,
+                (col + 1) * out_w // self.cols, (row + 1) * out_h // self.rows
+            ))
+        return boxes
+
+    @property
+    def slot_count(self):
+        return self.rows * self.cols
+
+    def rectify(self, frame):
+        """원본 프레임을 보관함 영역만 담은 정면 격자 이미지로 변환"""
+        return cv2.remap(frame, self.map1, self.map2, cv2.INTER_LINEAR)
+
+    def cell(self, rectified, index):
+        """보정된 이미지에서 슬롯 하나를 복사 없이 잘라낸 뷰"""
+        x0, y0, x1, y1 = self.cell_boxes[index]
+        return rectified[y0:y1, x0:x1]
+
+    def cells(self, rectified):
+        return [self.cell(rectified, i) for i in range(self.slot_count)]
+
+    def to_dict(self):
+        return {
+            'corners': self.corners,
+            'frame_size': self.frame_size,
+            'output_size': self.output_size,
+            'rows': self.rows,
+            'cols': self.cols
+        }
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        """보정 파일이 없으면 None 반환 (전체 프레임 사용)"""
+        if not path or not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['corners'], data['frame_size'], data.get('output_size', (600, 400)),
+                   data.get('rows', 2), data.get('cols', 3))
+
+def parse_point(text):
+    x, y = text.split(',')
+    return float(x), float(y)
+
+def main():
+    parser = argparse.ArgumentParser(description="보관함 모서리 보정값 저장 및 미리보기")
+    parser.add_argument('--corners', nargs=4, type=parse_point, required=True,
+                        metavar='X,Y', help='좌상 우상 우하 좌하 순서의 모서리 좌표')
+    parser.add_argument('--image', required=True, help='보정에 사용할 캡처 이미지')
+    parser.add_argument('--output-size', nargs=2, type=int, default=[600, 400], metavar=('W', 'H'))
+    parser.add_argument('--rows', type=int, default=2)
+    parser.add_argument('--cols', type=int, default=3)
+    parser.add_argument('--save', default='config/shelf_calibration.json', help='보정 파일 경로')
+    parser.add_argument('--preview', help='보정된 격자 이미지를 저장할 경로')
+    args = parser.parse_args()
+
+    frame = cv2.imread(args.image)
+    if frame is None:
+        raise SystemExit(f"이미지를 읽을 수 없습니다: {args.image}")
+
+    height, width = frame.shape[:2]
+    roi = ShelfROI(args.corners, (width, height), args.output_size, args.rows, args.cols)
+    roi.save(args.save)
+    print(f"보정 파일 저장: {args.save}")
+
+    if args.preview:
+        rectified = roi.rectify(frame)
+        for x0, y0, x1, y1 in roi.cell_boxes:
+            cv2.rectangle(rectified, (x0, y0), (x1 - 1, y1 - 1), (0, 255, 0), 1)
+        cv2.imwrite(args.preview, rectified)
+        print(f"미리보기 저장: {args.preview}")
+
+if __name__ == "__main__":
+    main()
@@ -9,19 +9,76 @@ class Settings:
         self.GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
         self.PIR_PIN = int(os.getenv('PIR_PIN', '18'))
         self.CAMERA_PORT = int(os.getenv('CAMERA_PORT', '0'))
+        self.CAMERA_BUFFER_SIZE = int(os.getenv('CAMERA_BUFFER_SIZE', '4'))
+        self.CAMERA_IDLE_TIMEOUT = float(os.getenv('CAMERA_IDLE_TIMEOUT', '30'))
+        self.CAMERA_WARMUP_FRAMES = int(os.getenv('CAMERA_WARMUP_FRAMES', '5'))
+        self.CAMERA_FRAME_TIMEOUT = float(os.getenv('CAMERA_FRAME_TIMEOUT', '3'))
+        self.CAMERA_ENCODE_FORMAT = os.getenv('CAMERA_ENCODE_FORMAT', 'jpeg')
+        self.CAMERA_ENCODE_QUALITY = int(os.getenv('CAMERA_ENCODE_QUALITY', '85'))
+        # 비어 있으면 캡처를 디스크에 저장하지 않음
+        self.CAMERA_ARCHIVE_DIR = os.getenv('CAMERA_ARCHIVE_DIR', '')
+        self.CAMERA_ARCHIVE_MAX_COUNT = int(os.getenv('CAMERA_ARCHIVE_MAX_COUNT', '500'))
+        self.CAMERA_ARCHIVE_MAX_BYTES = int(os.getenv('CAMERA_ARCHIVE_MAX_BYTES', str(200 * 1024 * 1024)))
+        self.CAMERA_ARCHIVE_MAX_AGE = int(os.getenv('CAMERA_ARCHIVE_MAX_AGE', str(7 * 24 * 3600)))
+        # 0이면 썸네일을 만들지 않음
+        self.CAMERA_ARCHIVE_THUMBNAIL_WIDTH = int(os.getenv('CAMERA_ARCHIVE_THUMBNAIL_WIDTH', '0'))
+        # 보관함 모서리 보정 파일 (python -m camera.shelf_roi 로 생성)
+        self.SHELF_CALIBRATION_FILE = os.getenv('SHELF_CALIBRATION_FILE', 'config/shelf_calibration.json')
+        # 셀 평균 밝기 차이가 이 값 이하면 Gemini 호출 생략
+        self.CHANGE_GATE_THRESHOLD = float(os.getenv('CHANGE_GATE_THRESHOLD', '12'))
+        # 빈 슬롯 기준값 파일 (python -m ai.slot_classifier 로 생성)
+        self.SLOT_BASELINE_FILE = os.getenv('SLOT_BASELINE_FILE', 'config/slot_baseline.npz')
+        # 모든 슬롯의 로컬 판정 신뢰도가 이 값 이상이면 Gemini 호출 생략
+        self.SLOT_CONFIDENCE_THRESHOLD = float(os.getenv('SLOT_CONFIDENCE_THRESHOLD', '0.6'))
+        # JSON 스키마 응답을 지원하는 모델이어야 함
+        self.GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-1.5-flash')
+        # 스트리밍 응답으로 슬롯 판정을 받는 즉시 SHELF_SLOT_DECIDED 발행
+        self.GEMINI_STREAM = os.getenv('GEMINI_STREAM', 'true').lower() == 'true'
+        self.GEMINI_TIMEOUT = float(os.getenv('GEMINI_TIMEOUT', '15'))
+        self.GEMINI_MAX_CONCURRENCY = int(os.getenv('GEMINI_MAX_CONCURRENCY', '2'))
+        self.ANALYSIS_CACHE_SIZE = int(os.getenv('ANALYSIS_CACHE_SIZE', '256'))
+        self.ANALYSIS_CACHE_TTL = int(os.getenv('ANALYSIS_CACHE_TTL', str(24 * 3600)))
+        # 비어 있으면 메모리 캐시만 사용
+        self.ANALYSIS_CACHE_FILE = os.getenv('ANALYSIS_CACHE_FILE', '')
+        # 모델 요청용 이미지 전처리 (TARGET_BYTES 0이면 예산 없음)
+        self.MODEL_IMAGE_MAX_SIDE = int(os.getenv('MODEL_IMAGE_MAX_SIDE', '512'))
+        self.MODEL_IMAGE_FORMAT = os.getenv('MODEL_IMAGE_FORMAT', 'jpeg')
+        self.MODEL_IMAGE_QUALITY = int(os.getenv('MODEL_IMAGE_QUALITY', '85'))
+        self.MODEL_IMAGE_TARGET_BYTES = int(os.getenv('MODEL_IMAGE_TARGET_BYTES', '0'))
+        self.MODEL_IMAGE_GRAYSCALE = os.getenv('MODEL_IMAGE_GRAYSCALE', 'false').lower() == 'true'
+        # 슬롯 순서(행 우선)대로 해당 슬롯을 올리는 아두이노 액추에이터 번호 (예: 1,2,3,4,5,6)
+        # 배선에 맞게 설정해야 하며, 비어 있으면 빈 슬롯 액추에이터 생략 기능을 사용하지 않음
+        slot_actuators = os.getenv('SHELF_SLOT_ACTUATORS', '')
+        self.SHELF_SLOT_ACTUATORS = slot_actuators.split(',') if slot_actuators else []
+        # frame: 전체 프레임 1장, parts: 셀 6장을 한 요청에, mosaic: 번호 붙인 셀 모자이크 1장
+        self.GEMINI_ANALYSIS_MODE = os.getenv('GEMINI_ANALYSIS_MODE', 'frame')
+        self.MODEL_CELL_MAX_SIDE = int(os.getenv('MODEL_CELL_MAX_SIDE', '160'))
         self.SERIAL_PORT = os.getenv('SERIAL_PORT', '/dev/ttyUSB0')
         self.SERIAL_BAUDRATE = int(os.getenv('SERIAL_BAUDRATE', '9600'))
         self.SERIAL_TIMEOUT = int(os.getenv('SERIAL_TIMEOUT', '2'))
         self.WEATHER_UPDATE_INTERVAL = int(os.getenv('WEATHER_UPDATE_INTERVAL', '300'))
         self.ACTUATOR_OPERATION_TIME = int(os.getenv('ACTUATOR_OPERATION_TIME', '6'))
+        # 설정하면 날씨 API와 Gemini가 로컬 시뮬레이터를 사용 (python -m simulator.upstream)
+        self.UPSTREAM_SIMULATOR_URL = os.getenv('UPSTREAM_SIMULATOR_URL', '')
+        # GUI 아이콘 아틀라스 PNG 경로 (없으면 처음 실행 때 생성, 비어 있으면 아틀라스 없이 메모이제이션만 사용)
+        self.ICON_ATLAS_PATH = os.getenv('ICON_ATLAS_PATH', '')
+        # --headless 실행 시 출력 대상 (/dev/fb0 등 프레임버퍼 또는 PNG 파일 경로)
+        self.HEADLESS_OUTPUT = os.getenv('HEADLESS_OUTPUT', 'dashboard.png')
+        # 보조 디스플레이용 스냅샷 API (포트 0이면 사용 안 함, 다른 기기에서 보려면 0.0.0.0 으로 지정)
+        self.SNAPSHOT_API_HOST = os.getenv('SNAPSHOT_API_HOST', '127.0.0.1')
+        self.SNAPSHOT_API_PORT = int(os.getenv('SNAPSHOT_API_PORT', '8080'))
+        # 날씨 -> 액추에이터 규칙 파일 (없으면 weather/rules.py 기본 규칙, python -m weather.rules 로 생성)
+        self.RULES_FILE = os.getenv('RULES_FILE', 'config/rules.json')
+        # 날씨 이력 (최근 24시간 원본, 30일 시간별, 이후 일별 - 비어 있으면 저장 안 함)
+        self.WEATHER_HISTORY_FILE = os.getenv('WEATHER_HISTORY_FILE', '')
+        self.WEATHER_HISTORY_MAX_DAYS = int(os.getenv('WEATHER_HISTORY_MAX_DAYS', '730'))
+        # Prometheus 텍스트 지표 (/metrics, 포트 0이면 사용 안 함)와 주기적 JSON 스냅샷 (비어 있으면 저장 안 함)
+        # 기본은 로컬에서만 수집 - 수집 서버가 직접 가져가려면 METRICS_HOST=0.0.0.0 지정
+        self.METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+        self.METRICS_PORT = int(os.getenv('METRICS_PORT', '9108'))
+        self.METRICS_SNAPSHOT_FILE = os.getenv('METRICS_SNAPSHOT_FILE', '')
+        self.METRICS_SNAPSHOT_INTERVAL = float(os.getenv('METRICS_SNAPSHOT_INTERVAL', '60'))
+        # 지표 스냅샷에 기록되는 키오스크 이름 (비어 있으면 호스트 이름)
+        self.KIOSK_ID = os.getenv('KIOSK_ID', '')
         self.LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
 
-        # Weather thresholds
-        self.THRESHOLDS = {
-            'precipitation': 0,
-            'cold_temp': 40,
-            'uv_sunscreen': 6,
-            'uv_sunglasses': 3,
-            'dust_bad': ['나쁨', '매우나쁨'],
-            'low_humidity': 40
-        }
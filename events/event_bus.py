@@ -1,17 +1,31 @@
 import asyncio
-from typing import Dict, List, Callable
+import time
+from typing import Dict, List, Callable, Optional
 from .event_types import Event, EventType
+from utils import metrics
+
+EVENTS = metrics.counter('event_bus_events', '발행된 이벤트 수', ('type',))
+DISPATCH_SECONDS = metrics.histogram('event_bus_dispatch_seconds', '이벤트 구독자 처리 완료까지 걸린 시간', ('type',))
 
 class EventBus:
     def __init__(self):
         self.subscribers: Dict[EventType, List[Callable]] = {}
+        # 늦게 구독한 쪽이 현재 상태를 알 수 있도록 타입별 마지막 이벤트 보관
+        self.last_events: Dict[EventType, Event] = {}
 
     def subscribe(self, event_type: EventType, callback: Callable):
         if event_type not in self.subscribers:
             self.subscribers[event_type] = []
         self.subscribers[event_type].append(callback)
 
+    def latest(self, event_type: EventType) -> Optional[Event]:
+        return self.last_events.get(event_type)
+
     async def emit(self, event: Event):
+        self.last_events[event.type] = event
+        EVENTS.labels(event.type.value).inc()
         if event.type in self.subscribers:
+            start = time.perf_counter()
             tasks = [callback(event) for callback in self.subscribers[event.type] if asyncio.iscoroutinefunction(callback)]
             await asyncio.gather(*tasks)
+            DISPATCH_SECONDS.labels(event.type.value).observe(time.perf_counter() - start)
@@ -4,11 +4,15 @@ from typing import Any, Dict, Optional
 
 class EventType(Enum):
     WEATHER_UPDATE = "weather_update"
+    WEATHER_SNAPSHOT = "weather_snapshot"
     ACTUATOR_POP = "actuator_pop"
+    ACTUATOR_STATE = "actuator_state"
     HUMAN_COME = "human_come"
     HUMAN_OUT = "human_out"
     CAMERA_CAPTURE = "camera_capture"
     GEMINI_RESPONSE = "gemini_response"
+    SHELF_ANALYZED = "shelf_analyzed"
+    SHELF_SLOT_DECIDED = "shelf_slot_decided"
 
 @dataclass
 class Event:
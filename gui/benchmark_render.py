@@ -0,0 +1,85 @@
+import argparse
+import os
+import resource
+import time
+import tracemalloc
+
+SAMPLE = {
+    'current_temp': '18°C', 'precipitation': '30%', 'max_temp': '22°C', 'min_temp': '11°C',
+    'uv_index': '5', 'dust': '보통', 'humidity': '55%'
+}
+
+def changed_sample(i):
+    """갱신마다 두 항목만 바뀌는 현실적인 스냅샷"""
+    data = dict(SAMPLE)
+    data['current_temp'] = f"{18 + i % 3}°C"
+    data['humidity'] = f"{55 + i % 5}%"
+    return data
+
+def rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def bench_headless(output, refreshes):
+    from gui.headless_renderer import HeadlessRenderer, PNGSink
+    tracemalloc.start()
+    start = time.process_time()
+    renderer = HeadlessRenderer()
+    sink = PNGSink(output)
+    sink.write(renderer.image, renderer.render_static())
+    renderer.update(SAMPLE, "start")
+    startup = time.process_time() - start
+
+    start = time.process_time()
+    for i in range(refreshes):
+        dirty = renderer.update(changed_sample(i), f"update {i}")
+        sink.write(renderer.image, dirty)
+    per_refresh = (time.process_time() - start) / refreshes
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"headless: startup {startup * 1000:.1f} ms CPU, refresh {per_refresh * 1000:.2f} ms CPU, "
+          f"python peak {peak / 1024 / 1024:.1f} MB, max RSS {rss_mb():.1f} MB")
+
+def bench_tk(refreshes):
+    from gui.weather_gui import WeatherGUI
+
+    class NullBus:
+        def subscribe(self, *args):
+            pass
+
+        def latest(self, *args):
+            return None
+
+    start = time.process_time()
+    gui = WeatherGUI(NullBus(), None)
+    gui.is_updating = True
+    gui.update()
+    startup = time.process_time() - start
+
+    start = time.process_time()
+    for i in range(refreshes):
+        gui.apply_changes(changed_sample(i))
+        gui.update_idletasks()
+    per_refresh = (time.process_time() - start) / refreshes
+    gui.destroy()
+
+    print(f"tk:       startup {startup * 1000:.1f} ms CPU, refresh {per_refresh * 1000:.2f} ms CPU, "
+          f"max RSS {rss_mb():.1f} MB")
+
+def main():
+    parser = argparse.ArgumentParser(description="헤드리스 렌더러와 Tk GUI 의 갱신 비용 비교")
+    parser.add_argument('--backend', choices=['headless', 'tk'], default='headless',
+                        help='RSS 비교를 위해 백엔드마다 별도 프로세스로 실행')
+    parser.add_argument('--refreshes', type=int, default=50)
+    parser.add_argument('--output', default='/tmp/dashboard_bench.png')
+    args = parser.parse_args()
+
+    if args.backend == 'tk':
+        if not os.environ.get('DISPLAY'):
+            raise SystemExit("Tk 측정에는 DISPLAY 가 필요합니다")
+        bench_tk(args.refreshes)
+    else:
+        bench_headless(args.output, args.refreshes)
+
+if __name__ == "__main__":
+    main()
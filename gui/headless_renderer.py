@@ -0,0 +1,209 @@
+import asyncio
+import math
+import os
+import threading
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+from events.event_types import EventType
+from gui import icons
+
+WIDTH, HEIGHT = 800, 480
+BACKGROUND = '#f5f5f5'
+PAD = 15
+STATUS_HEIGHT = 20
+
+# WeatherGUI.setup_detail_cards 와 같은 순서의 3x2 카드 (제목, 데이터 키, 아이콘)
+CARDS = [
+    ('강수확률', 'precipitation', 'rain'),
+    ('최고 기온', 'max_temp', 'temp'),
+    ('최저 기온', 'min_temp', 'temp'),
+    ('자외선 지수', 'uv_index', 'uv'),
+    ('미세먼지', 'dust', 'dust'),
+    ('습도', 'humidity', 'humidity'),
+]
+
+FONT_CANDIDATES = [
+    '/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf',
+    '/usr/share/fonts/truetype/nanum/NanumGothic.ttf',
+    '/usr/share/fonts/opentype/noto/NotoSansCJK-Bold.ttc',
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
+]
+
+def load_font(size):
+    for path in FONT_CANDIDATES:
+        if os.path.exists(path):
+            return ImageFont.truetype(path, size)
+    return ImageFont.load_default(size)
+
+class HeadlessRenderer:
+    """WeatherGUI.setup_ui 와 같은 배치를 PIL 로 직접 그리고 바뀐 영역만 다시 그리는 렌더러"""
+
+    def __init__(self):
+        self.fonts = {size: load_font(size) for size in (8, 10, 14, 16, 32)}
+        self.image = Image.new('RGB', (WIDTH, HEIGHT), BACKGROUND)
+        self.draw = ImageDraw.Draw(self.image)
+        self.values = {}
+
+        # 왼쪽 정사각형 (현재 온도)
+        self.main_box = (PAD, PAD, PAD + 280, PAD + 280)
+        self.regions = {'current_temp': (PAD + 4, PAD + 190, PAD + 276, PAD + 260)}
+
+        # 오른쪽 3x2 카드 격자
+        right_x0 = PAD + 280 + PAD
+        right_x1 = WIDTH - PAD
+        bottom = HEIGHT - STATUS_HEIGHT - PAD
+        card_w = (right_x1 - right_x0) // 3
+        card_h = (bottom - PAD) // 2
+        self.card_boxes = {}
+        for i, (_, key, _) in enumerate(CARDS):
+            row, col = divmod(i, 3)
+            x0 = right_x0 + col * card_w + 8
+            y0 = PAD + row * card_h + 8
+            box = (x0, y0, x0 + card_w - 16, y0 + card_h - 16)
+            self.card_boxes[key] = box
+            # WeatherGUI 처럼 아이콘, 제목 바로 아래에 값 표시
+            self.regions[key] = (box[0] + 4, box[1] + 74, box[2] - 4, box[1] + 106)
+
+        self.regions['status'] = (0, HEIGHT - STATUS_HEIGHT, WIDTH, HEIGHT)
+
+    def render_static(self):
+        """값을 제외한 배경, 테두리, 제목, 아이콘을 한 번만 그림"""
+        self.draw.rectangle((0, 0, WIDTH, HEIGHT), fill=BACKGROUND)
+        self.draw.rectangle(self.main_box, fill='white', outline='black', width=2)
+        self.center_text(self.main_box[0], self.main_box[2], PAD + 45, "현재 온도", 16, '#495057')
+        temp_icon = icons.render_icon('temp', (80, 80))
+        self.image.paste(temp_icon, (PAD + 100, PAD + 85), temp_icon)
+
+        for title, key, icon_type in CARDS:
+            box = self.card_boxes[key]
+            self.draw.rectangle(box, fill='white', outline='black', width=2)
+            icon = icons.render_icon(icon_type, (40, 40))
+            self.image.paste(icon, ((box[0] + box[2]) // 2 - 20, box[1] + 10), icon)
+            self.center_text(box[0], box[2], box[1] + 62, title, 10, '#6c757d')
+
+        return [(0, 0, WIDTH, HEIGHT)]
+
+    def center_text(self, x0, x1, y_center, text, size, fill):
+        font = self.fonts[size]
+        left, top, right, bottom = self.draw.textbbox((0, 0), text, font=font)
+        x = (x0 + x1 - (right - left)) // 2 - left
+        y = y_center - (bottom - top) // 2 - top
+        self.draw.text((x, y), text, font=font, fill=fill)
+
+    def update(self, changes, status=None):
+        """바뀐 항목의 영역만 지우고 다시 그린 뒤 갱신된 영역 목록 반환"""
+        dirty = []
+        for key, value in changes.items():
+            if key not in self.regions or self.values.get(key) == value:
+                continue
+            self.values[key] = value
+            box = self.regions[key]
+            self.draw.rectangle(box, fill='white')
+            size = 32 if key == 'current_temp' else 14
+            self.center_text(box[0], box[2], (box[1] + box[3]) // 2, value, size, '#212529')
+            dirty.append(box)
+
+        if status is not None and self.values.get('status') != status:
+            self.values['status'] = status
+            box = self.regions['status']
+            self.draw.rectangle(box, fill='#e9ecef')
+            self.center_text(box[0], box[2], (box[1] + box[3]) // 2, status, 8, '#6c757d')
+            dirty.append(box)
+
+        return dirty
+
+class PNGSink:
+    """전체 화면을 PNG 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def write(self, image, dirty):
+        tmp_path = self.path + '.tmp'
+        image.save(tmp_path, format='PNG')
+        os.replace(tmp_path, self.path)
+
+class FramebufferSink:
+    """리눅스 프레임버퍼에 바뀐 영역의 줄만 기록 (16비트 RGB565 또는 32비트 BGRA)
+
+    패널이 800x480 보다 작으면(480x320 SPI 패널 등) 비율을 유지해 축소하고, 크면 왼쪽 위에 그림
+    """
+
+    def __init__(self, device='/dev/fb0', sysfs='/sys/class/graphics'):
+        name = os.path.basename(device)
+        with open(f'{sysfs}/{name}/bits_per_pixel') as f:
+            self.bpp = int(f.read())
+        with open(f'{sysfs}/{name}/stride') as f:
+            self.stride = int(f.read())
+        with open(f'{sysfs}/{name}/virtual_size') as f:
+            self.width, self.height = (int(v) for v in f.read().split(','))
+        self.scale = min(1.0, self.width / WIDTH, self.height / HEIGHT)
+        self.device = open(device, 'r+b', buffering=0)
+
+    def convert(self, region):
+        pixels = np.asarray(region, dtype=np.uint16)
+        if self.bpp == 16:
+            r, g, b = pixels[..., 0], pixels[..., 1], pixels[..., 2]
+            return ((r >> 3) << 11 | (g >> 2) << 5 | (b >> 3)).astype('<u2')
+        bgra = np.empty(pixels.shape[:2] + (4,), dtype=np.uint8)
+        bgra[..., 0] = pixels[..., 2]
+        bgra[..., 1] = pixels[..., 1]
+        bgra[..., 2] = pixels[..., 0]
+        bgra[..., 3] = 255
+        return bgra
+
+    def fit(self, image, dirty):
+        """패널보다 크면 전체를 축소하고 갱신 영역도 같은 비율로 변환 (경계 픽셀 포함)"""
+        if self.scale == 1.0:
+            return image, dirty
+        size = (int(WIDTH * self.scale), int(HEIGHT * self.scale))
+        image = image.resize(size, Image.BILINEAR)
+        dirty = [(int(x0 * self.scale) - 1, int(y0 * self.scale) - 1,
+                  math.ceil(x1 * self.scale) + 1, math.ceil(y1 * self.scale) + 1) for x0, y0, x1, y1 in dirty]
+        return image, dirty
+
+    def write(self, image, dirty):
+        image, dirty = self.fit(image, dirty)
+        bytes_per_pixel = self.bpp // 8
+        for x0, y0, x1, y1 in dirty:
+            # 패널과 이미지 범위를 넘는 부분은 잘라냄 (넘겨 쓰면 다음 줄로 이어져 화면이 깨짐)
+            x0, y0 = max(0, x0), max(0, y0)
+            x1, y1 = min(x1, self.width, image.width), min(y1, self.height, image.height)
+            if x0 >= x1 or y0 >= y1:
+                continue
+            rows = self.convert(image.crop((x0, y0, x1, y1)))
+            for i, row in enumerate(rows):
+                self.device.seek((y0 + i) * self.stride + x0 * bytes_per_pixel)
+                self.device.write(row.tobytes())
+
+def make_sink(output):
+    if output.startswith('/dev/fb'):
+        return FramebufferSink(output)
+    return PNGSink(output)
+
+class HeadlessDashboard:
+    """Tk 없이 WEATHER_SNAPSHOT 을 받아 프레임버퍼나 PNG 로 그리는 대시보드"""
+
+    def __init__(self, event_bus, settings):
+        self.event_bus = event_bus
+        self.renderer = HeadlessRenderer()
+        self.sink = make_sink(settings.HEADLESS_OUTPUT)
+        self._lock = threading.Lock()
+        self.sink.write(self.renderer.image, self.renderer.render_static())
+        self.event_bus.subscribe(EventType.WEATHER_SNAPSHOT, self.on_snapshot)
+
+    async def on_snapshot(self, event):
+        if 'error' in event.detail:
+            status = f"업데이트 오류: {event.detail['error']}"
+            changes = {}
+        else:
+            status = f"마지막 업데이트: {event.detail['timestamp'].strftime('%H:%M:%S')}"
+            changes = event.detail['data']
+        # 그리기와 출력은 이벤트 루프 밖에서 실행
+        await asyncio.get_running_loop().run_in_executor(None, self.refresh, changes, status)
+
+    def refresh(self, changes, status):
+        with self._lock:
+            dirty = self.renderer.update(changes, status)
+            if dirty:
+                self.sink.write(self.renderer.image, dirty)
@@ -0,0 +1,191 @@
+import json
+import math
+import os
+from functools import lru_cache
+from PIL import Image, ImageDraw
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# 아틀라스 내용이 바뀌면 올려서 디스크 캐시를 무효화
+ATLAS_VERSION = 1
+
+# 화면에서 사용하는 (아이콘 종류, 크기) 목록
+ICON_SPECS = [
+    ('temp', (80, 80)),
+    ('rain', (40, 40)),
+    ('temp', (40, 40)),
+    ('uv', (40, 40)),
+    ('dust', (40, 40)),
+    ('humidity', (40, 40)),
+]
+
+# 아틀라스에서 불러온 아이콘 - render_icon 보다 먼저 확인
+_preloaded = {}
+
+def draw_icon(icon_type, size=(50, 50)):
+    """아이콘 한 개를 PIL 이미지로 그리기"""
+    icon = Image.new('RGBA', size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(icon)
+
+    if icon_type == 'temp':
+        # 온도계
+        bulb_size = min(size[0]//4, size[1]//4)
+        stem_height = int(size[1] * 0.5)
+        stem_width = max(2, size[0]//15)
+
+        # 하단 bulb
+        draw.ellipse((size[0]//2 - bulb_size, size[1] - 2*bulb_size,
+                     size[0]//2 + bulb_size, size[1]), fill='#ff6b6b')
+
+        # 줄기
+        draw.rectangle((size[0]//2 - stem_width, size[1] - stem_height - bulb_size,
+                       size[0]//2 + stem_width, size[1] - bulb_size), fill='#ff6b6b')
+
+        # 상단 원
+        top_bulb = max(3, size[0]//15)
+        draw.ellipse((size[0]//2 - top_bulb, size[1] - stem_height - bulb_size - top_bulb*2,
+                     size[0]//2 + top_bulb, size[1] - stem_height - bulb_size + top_bulb*2), fill='#ff6b6b')
+
+    elif icon_type == 'rain':
+        # 비
+        draw.ellipse((size[0]*0.2, size[1]*0.1, size[0]*0.8, size[1]*0.5), fill='#74c0fc')
+
+        # 빗방울
+        for i in range(3):
+            x = size[0]*0.3 + i * size[0]*0.2
+            draw.line([(x, size[1]*0.6), (x-size[0]*0.05, size[1]*0.85)], fill='#339af0', width=max(1, size[0]//20))
+
+    elif icon_type == 'uv':
+        # 태양
+        center = (size[0]//2, size[1]//2)
+        sun_radius = min(size[0], size[1]) // 6
+        draw.ellipse((center[0]-sun_radius, center[1]-sun_radius,
+                     center[0]+sun_radius, center[1]+sun_radius), fill='#ffd43b')
+
+        # 햇살
+        for i in range(8):
+            angle = i * 45
+            ray_length = min(size[0], size[1]) // 4
+            x1 = center[0] + ray_length * math.cos(math.radians(angle))
+            y1 = center[1] + ray_length * math.sin(math.radians(angle))
+            draw.line([center, (x1, y1)], fill='#ffd43b', width=max(1, size[0]//25))
+
+    elif icon_type == 'dust':
+        # 먼지
+        dust_size = max(4, size[0]//10)
+        for i in range(6):
+            x = size[0]*0.25 + (i % 3) * size[0]*0.25
+            y = size[1]*0.3 + (i // 3) * size[1]*0.25
+            draw.ellipse((x, y, x+dust_size, y+dust_size), fill='#868e96')
+
+    elif icon_type == 'humidity':
+        # 물방울
+        drop_width = min(size[0], size[1]) // 3
+        drop_height = min(size[0], size[1]) // 2
+
+        # 물방울 몸통
+        draw.ellipse((size[0]//2 - drop_width//2, size[1]//2 + drop_height//4,
+                     size[0]//2 + drop_width//2, size[1]//2 + drop_height), fill='#339af0')
+
+        # 물방울 꼭지점
+        draw.polygon([(size[0]//2, size[1]//2 - drop_height//4),
+                     (size[0]//2 - drop_width//2, size[1]//2 + drop_height//4),
+                     (size[0]//2 + drop_width//2, size[1]//2 + drop_height//4)], fill='#339af0')
+
+    return icon
+
+@lru_cache(maxsize=64)
+def render_icon(icon_type, size=(50, 50)):
+    """(종류, 크기)별로 한 번만 그려서 재사용 - 반환된 이미지는 수정하지 말 것"""
+    key = (icon_type, tuple(size))
+    if key in _preloaded:
+        return _preloaded[key]
+    return draw_icon(icon_type, tuple(size))
+
+def build_atlas(specs, path):
+    """아이콘들을 가로로 이어 붙인 PNG와 위치 정보 JSON 저장"""
+    icons = [(icon_type, tuple(size), draw_icon(icon_type, tuple(size))) for icon_type, size in specs]
+    width = sum(icon.width for _, _, icon in icons)
+    height = max(icon.height for _, _, icon in icons)
+    atlas = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+
+    boxes = []
+    x = 0
+    for icon_type, size, icon in icons:
+        atlas.paste(icon, (x, 0))
+        boxes.append({'type': icon_type, 'size': size, 'box': [x, 0, x + icon.width, icon.height]})
+        x += icon.width
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    atlas.save(path, format='PNG')
+    with open(path + '.json', 'w', encoding='utf-8') as f:
+        json.dump({'version': ATLAS_VERSION, 'icons': boxes}, f)
+    return atlas, boxes
+
+def load_atlas(path):
+    """디스크 아틀라스에서 아이콘을 잘라 미리 등록 - 없거나 버전이 다르면 False"""
+    try:
+        with open(path + '.json', 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('version') != ATLAS_VERSION:
+            return False
+        atlas = Image.open(path)
+        atlas.load()
+    except (OSError, ValueError):
+        return False
+
+    for entry in index['icons']:
+        _preloaded[(entry['type'], tuple(entry['size']))] = atlas.crop(tuple(entry['box']))
+    render_icon.cache_clear()
+    return True
+
+def preload(path, specs=ICON_SPECS):
+    """시작 시 호출 - 아틀라스를 불러오고, 없으면 한 번 그려서 저장 (path 가 비어 있으면 메모이제이션만 사용)"""
+    if not path:
+        return False
+    if load_atlas(path):
+        return True
+    try:
+        build_atlas(specs, path)
+    except OSError as e:
+        log.warning("아이콘 아틀라스 저장 실패", error=e)
+        return False
+    return load_atlas(path)
+
+def benchmark(path, repeat=50):
+    """기존 방식(카드마다 새로 그림), 메모이제이션, 아틀라스 로드 시간 비교 (ms)"""
+    import time
+    # 기존 setup_ui 는 temp 아이콘을 세 번 포함해 매번 모든 아이콘을 새로 그림
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for icon_type, size in ICON_SPECS:
+            draw_icon(icon_type, size)
+    redraw = (time.perf_counter() - start) * 1000 / repeat
+
+    build_atlas(ICON_SPECS, path)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        _preloaded.clear()
+        load_atlas(path)
+    atlas = (time.perf_counter() - start) * 1000 / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for icon_type, size in ICON_SPECS:
+            render_icon(icon_type, size)
+    memoized = (time.perf_counter() - start) * 1000 / repeat
+
+    print(f"redraw: {redraw:.3f} ms, atlas load: {atlas:.3f} ms, memoized: {memoized:.4f} ms")
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="아이콘 아틀라스 생성 및 렌더링 시간 측정")
+    parser.add_argument('--build', metavar='PATH', help='아틀라스를 이 경로에 생성')
+    parser.add_argument('--benchmark', metavar='PATH', help='이 경로에 임시 아틀라스를 만들어 시간 측정')
+    args = parser.parse_args()
+    if args.build:
+        build_atlas(ICON_SPECS, args.build)
+        print(f"아이콘 아틀라스 저장: {args.build}")
+    if args.benchmark:
+        benchmark(args.benchmark)
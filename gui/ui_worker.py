@@ -0,0 +1,70 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+class GuiWorker:
+    """GUI 용 단일 백그라운드 실행기와 Tk 메인 스레드가 비우는 UI 작업 큐
+
+    - submit: 같은 key 의 작업이 실행 중이면 새로 만들지 않고 기존 Future 반환 (running 으로 확인 가능)
+    - post: 어느 스레드에서든 호출 가능, 위젯 변경은 반드시 이 큐를 거쳐 메인 스레드에서 실행
+    """
+
+    def __init__(self, root, max_workers=1, poll_ms=50):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='gui-io')
+        self.ui_queue = queue.SimpleQueue()
+        self.inflight = {}
+        self._lock = threading.Lock()
+        self._running = False
+
+    def start(self):
+        """Tk 루프에서 UI 큐 비우기 시작 (메인 스레드에서 호출)"""
+        if not self._running:
+            self._running = True
+            self.root.after(self.poll_ms, self.drain)
+
+    def submit(self, key, fn, *args):
+        with self._lock:
+            future = self.inflight.get(key)
+            if future is not None and not future.done():
+                return future
+            future = self.executor.submit(fn, *args)
+            self.inflight[key] = future
+        future.add_done_callback(lambda f: self._finished(key, f))
+        return future
+
+    def running(self, key):
+        """같은 key 의 작업이 아직 실행 중인지"""
+        with self._lock:
+            future = self.inflight.get(key)
+            return future is not None and not future.done()
+
+    def _finished(self, key, future):
+        with self._lock:
+            if self.inflight.get(key) is future:
+                del self.inflight[key]
+
+    def post(self, fn, *args):
+        self.ui_queue.put((fn, args))
+
+    def drain(self):
+        """대기 중인 UI 작업을 모두 실행한 뒤 다음 확인 예약"""
+        while True:
+            try:
+                fn, args = self.ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                fn(*args)
+            except Exception:
+                log.exception("UI 작업 오류")
+        if self._running:
+            self.root.after(self.poll_ms, self.drain)
+
+    def shutdown(self):
+        self._running = False
+        self.executor.shutdown(wait=False, cancel_futures=True)
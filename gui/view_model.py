@@ -0,0 +1,71 @@
+import threading
+from events.event_types import EventType
+
+class WeatherViewModel:
+    """발행된 날씨 스냅샷을 화면 값과 비교해 바뀐 항목만 GUI 에 반영하는 뷰 모델"""
+
+    # 화면에 표시되는 항목
+    FIELDS = ('current_temp', 'precipitation', 'max_temp', 'min_temp', 'uv_index', 'dust', 'humidity')
+
+    def __init__(self, gui, event_bus, worker):
+        self.gui = gui
+        self.event_bus = event_bus
+        # 위젯 변경은 워커의 UI 큐를 통해 Tk 메인 스레드에서만 실행
+        self.worker = worker
+
+        # 현재 화면에 표시된 값과 아직 반영되지 않은 변경분
+        self.displayed = {key: gui.weather_data[key] for key in self.FIELDS}
+        self.pending = {}
+        self.pending_error = None
+        self.snapshot_time = None
+        self.flush_scheduled = False
+        self._lock = threading.Lock()
+
+        self.event_bus.subscribe(EventType.WEATHER_SNAPSHOT, self.on_snapshot)
+        # GUI 가 뜨기 전에 이미 발행된 스냅샷이 있으면 바로 반영
+        latest = self.event_bus.latest(EventType.WEATHER_SNAPSHOT)
+        if latest is not None:
+            self.apply_snapshot(latest.detail)
+
+    async def on_snapshot(self, event):
+        """백그라운드 루프에서 호출됨"""
+        self.apply_snapshot(event.detail)
+
+    def apply_snapshot(self, detail):
+        with self._lock:
+            if 'error' in detail:
+                self.pending_error = detail['error']
+            else:
+                data = detail['data']
+                for key in self.FIELDS:
+                    value = data.get(key)
+                    if value is None:
+                        continue
+                    if value != self.displayed[key]:
+                        self.pending[key] = value
+                    else:
+                        # 반영 전에 원래 값으로 돌아왔으면 변경 취소
+                        self.pending.pop(key, None)
+                self.pending_error = None
+                self.snapshot_time = detail['timestamp']
+
+            # 여러 스냅샷이 몰려도 갱신 작업은 한 번만 예약
+            if self.flush_scheduled:
+                return
+            self.flush_scheduled = True
+        self.worker.post(self.flush)
+
+    def flush(self):
+        """Tk 메인 스레드에서 바뀐 위젯만 한 번에 갱신"""
+        with self._lock:
+            changes, self.pending = self.pending, {}
+            error, self.pending_error = self.pending_error, None
+            snapshot_time = self.snapshot_time
+            self.flush_scheduled = False
+            self.displayed.update(changes)
+
+        # 오류 스냅샷보다 먼저 도착한 변경분도 displayed 에 반영했으므로 위젯에 적용한 뒤 오류 표시
+        if changes or not error:
+            self.gui.apply_changes(changes, snapshot_time)
+        if error:
+            self.gui.update_error(error)
@@ -1,14 +1,22 @@
 import tkinter as tk
 from tkinter import ttk, font
-from PIL import Image, ImageTk, ImageDraw
-import threading
+from PIL import ImageTk
 import asyncio
+import concurrent.futures
 from datetime import datetime
 from events.event_types import Event, EventType
-from weather.weather_api import WeatherAPI
+from gui.view_model import WeatherViewModel
+from gui.ui_worker import GuiWorker
+from gui import icons
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# 새로고침 이벤트 체인(날씨 갱신, 액추에이터 동작, 캡처) 최대 대기 시간 - 넘으면 취소하고 버튼 복원
+REFRESH_TIMEOUT = 30.0
 
 class WeatherGUI(tk.Tk):
-    def __init__(self, event_bus, background_loop):
+    def __init__(self, event_bus, background_loop, startup=None, icon_atlas_path=''):
         super().__init__()
         self.title("라즈베리파이 날씨 정보")
         # 800x480 해상도로 조정
@@ -21,14 +29,15 @@ class WeatherGUI(tk.Tk):
         # 이벤트 버스 연결
         self.event_bus = event_bus
         self.background_loop = background_loop  # 백그라운드 루프 참조 추가
-        self.event_bus.subscribe(EventType.WEATHER_UPDATE, self.on_weather_update)
+        # 서비스 준비 상태 (시작 직후 클릭은 날씨 서비스가 준비될 때까지 대기)
+        self.startup = startup
 
-        # 날씨 API 인스턴스
-        self.weather_api = WeatherAPI()
-
-        # 업데이트 상태 플래그
+        # 업데이트 상태 플래그 (메인 스레드에서만 변경)
         self.is_updating = False
 
+        # GUI I/O 용 단일 워커와 메인 스레드 UI 큐
+        self.worker = GuiWorker(self)
+
         # 날씨 데이터 초기값
         self.weather_data = {
             'current_temp': '--°C',
@@ -40,11 +49,15 @@ class WeatherGUI(tk.Tk):
             'humidity': '--%'
         }
 
+        # 아이콘 PhotoImage 캐시 (설정된 경우 디스크 아틀라스에서 미리 로드)
+        self.icon_images = {}
+        icons.preload(icon_atlas_path)
+
         self.setup_ui()
-        self.update_weather_data()
 
-        # 10분마다 데이터 자동 업데이트
-        self.auto_update()
+        # 날씨 서비스가 발행하는 스냅샷을 받아 바뀐 값만 갱신 (자체 폴링 없음)
+        self.view_model = WeatherViewModel(self, self.event_bus, self.worker)
+        self.worker.start()
 
     def setup_fonts(self):
         """Raspberry Pi에서 사용 가능한 한국어 폰트 설정"""
@@ -63,12 +76,12 @@ class WeatherGUI(tk.Tk):
         for font_name in font_candidates:
             if font_name in available_fonts:
                 self.korean_font = font_name
-                print(f"사용할 폰트: {font_name}")
+                log.info("사용할 폰트", font=font_name)
                 break
 
         if not self.korean_font:
             self.korean_font = 'TkDefaultFont'
-            print("한국어 폰트를 찾을 수 없어 기본 폰트 사용")
+            log.warning("한국어 폰트를 찾을 수 없어 기본 폰트 사용")
 
     def setup_ui(self):
         """기존 레이아웃 구조 유지 - 800x480 크기 최적화"""
@@ -113,77 +126,11 @@ class WeatherGUI(tk.Tk):
         self.status_bar.pack(side='bottom', fill='x')
 
     def create_icon(self, icon_type, size=(50, 50)):
-        """아이콘 생성 - 크기 축소"""
-        icon = Image.new('RGBA', size, (0, 0, 0, 0))
-        draw = ImageDraw.Draw(icon)
-
-        if icon_type == 'temp':
-            # 온도계
-            bulb_size = min(size[0]//4, size[1]//4)
-            stem_height = int(size[1] * 0.5)
-            stem_width = max(2, size[0]//15)
-
-            # 하단 bulb
-            draw.ellipse((size[0]//2 - bulb_size, size[1] - 2*bulb_size,
-                         size[0]//2 + bulb_size, size[1]), fill='#ff6b6b')
-
-            # 줄기
-            draw.rectangle((size[0]//2 - stem_width, size[1] - stem_height - bulb_size,
-                           size[0]//2 + stem_width, size[1] - bulb_size), fill='#ff6b6b')
-
-            # 상단 원
-            top_bulb = max(3, size[0]//15)
-            draw.ellipse((size[0]//2 - top_bulb, size[1] - stem_height - bulb_size - top_bulb*2,
-                         size[0]//2 + top_bulb, size[1] - stem_height - bulb_size + top_bulb*2), fill='#ff6b6b')
-
-        elif icon_type == 'rain':
-            # 비
-            draw.ellipse((size[0]*0.2, size[1]*0.1, size[0]*0.8, size[1]*0.5), fill='#74c0fc')
-
-            # 빗방울
-            for i in range(3):
-                x = size[0]*0.3 + i * size[0]*0.2
-                draw.line([(x, size[1]*0.6), (x-size[0]*0.05, size[1]*0.85)], fill='#339af0', width=max(1, size[0]//20))
-
-        elif icon_type == 'uv':
-            # 태양
-            center = (size[0]//2, size[1]//2)
-            sun_radius = min(size[0], size[1]) // 6
-            draw.ellipse((center[0]-sun_radius, center[1]-sun_radius,
-                         center[0]+sun_radius, center[1]+sun_radius), fill='#ffd43b')
-
-            # 햇살
-            import math
-            for i in range(8):
-                angle = i * 45
-                ray_length = min(size[0], size[1]) // 4
-                x1 = center[0] + ray_length * math.cos(math.radians(angle))
-                y1 = center[1] + ray_length * math.sin(math.radians(angle))
-                draw.line([center, (x1, y1)], fill='#ffd43b', width=max(1, size[0]//25))
-
-        elif icon_type == 'dust':
-            # 먼지
-            dust_size = max(4, size[0]//10)
-            for i in range(6):
-                x = size[0]*0.25 + (i % 3) * size[0]*0.25
-                y = size[1]*0.3 + (i // 3) * size[1]*0.25
-                draw.ellipse((x, y, x+dust_size, y+dust_size), fill='#868e96')
-
-        elif icon_type == 'humidity':
-            # 물방울
-            drop_width = min(size[0], size[1]) // 3
-            drop_height = min(size[0], size[1]) // 2
-
-            # 물방울 몸통
-            draw.ellipse((size[0]//2 - drop_width//2, size[1]//2 + drop_height//4,
-                         size[0]//2 + drop_width//2, size[1]//2 + drop_height), fill='#339af0')
-
-            # 물방울 꼭지점
-            draw.polygon([(size[0]//2, size[1]//2 - drop_height//4),
-                         (size[0]//2 - drop_width//2, size[1]//2 + drop_height//4),
-                         (size[0]//2 + drop_width//2, size[1]//2 + drop_height//4)], fill='#339af0')
-
-        return ImageTk.PhotoImage(icon)
+        """아이콘 생성 - (종류, 크기)별 PhotoImage 를 한 번만 만들어 카드끼리 공유"""
+        key = (icon_type, tuple(size))
+        if key not in self.icon_images:
+            self.icon_images[key] = ImageTk.PhotoImage(icons.render_icon(icon_type, tuple(size)))
+        return self.icon_images[key]
 
     def setup_main_display(self):
         """메인 디스플레이 (현재 온도) 설정 - 크기 축소"""
@@ -253,107 +200,79 @@ class WeatherGUI(tk.Tk):
         for i in range(2):
             self.right_frame.grid_rowconfigure(i, weight=1)
 
-    def on_weather_update(self, event):
-        """이벤트 버스에서 날씨 업데이트 이벤트 수신"""
-        print("이벤트 버스에서 날씨 업데이트 요청 수신")
-        self.update_weather_data()
-
     def manual_update(self):
-        """수동 업데이트 버튼 클릭 시 호출 - 스레드 안전한 이벤트 발행 + GUI 업데이트"""
+        """수동 업데이트 버튼 클릭 시 호출 - 진행 중인 새로고침이 있으면 클릭을 흡수"""
         if self.is_updating:
             return
+        # 스냅샷이 먼저 도착해 버튼은 복원됐지만 액추에이터/카메라 흐름이 아직 진행 중이면
+        # submit 이 기존 작업을 반환하므로 버튼을 다시 비활성화하지 않음
+        if self.worker.running('refresh'):
+            log.debug("이전 새로고침 진행 중 - 클릭 무시")
+            return
+        self.is_updating = True
 
-        print("GUI 새로고침 버튼 클릭 - 전체 시스템 플로우 시작")
+        log.info("GUI 새로고침 버튼 클릭 - 전체 시스템 플로우 시작")
 
         # 버튼 상태 변경
         self.update_button.config(text="⏳ 업데이트중", state='disabled')
         self.status_bar.config(text="전체 시스템 업데이트 중...")
 
-        def emit_weather_event():
-            """스레드 안전한 방식으로 WEATHER_UPDATE 이벤트 발행"""
-            try:
-                # call_soon_threadsafe를 사용해서 백그라운드 루프에 이벤트 발행
-                self.background_loop.call_soon_threadsafe(
-                    self._emit_event_sync,
-                    Event(EventType.WEATHER_UPDATE, {})
-                )
-                print("WEATHER_UPDATE 이벤트 발행 완료")
-                
-            except Exception as e:
-                print(f"이벤트 발행 오류: {e}")
-                self.after(0, lambda: self.update_error(str(e)))
-
-        def fetch_gui_data():
-            """GUI 업데이트용 데이터 가져오기"""
-            try:
-                self.is_updating = True
-                new_data = self.weather_api.get_all_weather_data(force_refresh=True)
-                self.after(0, lambda: self.update_ui(new_data))
-            except Exception as e:
-                print(f"GUI 업데이트 오류: {e}")
-                self.after(0, lambda: self.update_error(str(e)))
-            finally:
-                self.is_updating = False
-
-        # 1. 이벤트 발행 (백그라운드 서비스들 동작 시작)
-        event_thread = threading.Thread(target=emit_weather_event, daemon=True)
-        event_thread.start()
-
-        # 2. GUI 업데이트 (화면 표시용)
-        gui_thread = threading.Thread(target=fetch_gui_data, daemon=True)
-        gui_thread.start()
-
-    def _emit_event_sync(self, event):
-        """백그라운드 루프에서 실행될 이벤트 발행 함수"""
-        asyncio.create_task(self.event_bus.emit(event))
-
-    def update_weather_data(self):
-        """날씨 데이터 업데이트 (자동 업데이트용 - 기존 방식 유지)"""
-        def fetch_data():
-            try:
-                self.is_updating = True
-                self.status_bar.config(text="날씨 데이터 업데이트 중...")
-                new_data = self.weather_api.get_all_weather_data()
-                # UI 업데이트 (메인 스레드에서 실행)
-                self.after(0, lambda: self.update_ui(new_data))
-            except Exception as e:
-                print(f"날씨 데이터 업데이트 오류: {e}")
-                self.after(0, lambda: self.update_error(str(e)))
-            finally:
-                self.is_updating = False
-
-        # 백그라운드에서 API 호출
-        thread = threading.Thread(target=fetch_data)
-        thread.daemon = True
-        thread.start()
-
-    def update_ui(self, new_data):
-        """UI 업데이트"""
-        self.weather_data.update(new_data)
-
-        # 메인 온도 업데이트
-        self.temp_value.config(text=self.weather_data['current_temp'])
-
-        # 카드 데이터 업데이트
-        for data_key, label in self.card_labels.items():
-            label.config(text=self.weather_data[data_key])
+        # 이벤트 발행 (백그라운드 서비스들 동작 시작, 갱신된 스냅샷은 뷰 모델로 도착)
+        future = self.worker.submit('refresh', self.request_refresh)
+        # 스냅샷 변경이 없어도 새로고침이 끝나면 버튼 복원
+        future.add_done_callback(lambda _: self.worker.post(self.restore_button))
+
+    def request_refresh(self):
+        """GUI 워커 스레드에서 실행 - 백그라운드 루프의 새로고침이 끝날 때까지 대기"""
+        future = None
+        try:
+            if self.startup is not None:
+                future = asyncio.run_coroutine_threadsafe(self.startup.wait_ready('weather'), self.background_loop)
+                future.result(timeout=REFRESH_TIMEOUT)
+            future = asyncio.run_coroutine_threadsafe(
+                self.event_bus.emit(Event(EventType.WEATHER_UPDATE, {'force_refresh': True})),
+                self.background_loop
+            )
+            log.debug("WEATHER_UPDATE 이벤트 발행 완료")
+            future.result(timeout=REFRESH_TIMEOUT)
+        except concurrent.futures.TimeoutError:
+            # 시리얼 쓰기나 카메라 읽기가 멈춰도 단일 워커가 계속 묶여 있지 않도록 취소
+            future.cancel()
+            log.error("새로고침 시간 초과", timeout=REFRESH_TIMEOUT)
+            self.worker.post(self.update_error, "시간 초과")
+        except Exception as e:
+            log.error("이벤트 발행 오류", error=e)
+            self.worker.post(self.update_error, str(e))
+
+    def apply_changes(self, changes, snapshot_time=None):
+        """뷰 모델이 계산한 변경분만 위젯에 반영"""
+        self.weather_data.update(changes)
+
+        for data_key, value in changes.items():
+            if data_key == 'current_temp':
+                self.temp_value.config(text=value)
+            label = self.card_labels.get(data_key)
+            if label is not None:
+                label.config(text=value)
 
         # 상태바 및 버튼 복원
-        current_time = datetime.now().strftime("%H:%M:%S")
+        current_time = (snapshot_time or datetime.now()).strftime("%H:%M:%S")
         self.status_bar.config(text=f"마지막 업데이트: {current_time}")
-        self.update_button.config(text="🔄 새로고침", state='normal')
+        self.restore_button()
 
     def update_error(self, error_msg):
         """업데이트 오류 처리"""
         self.status_bar.config(text=f"업데이트 오류: {error_msg}")
-        self.update_button.config(text="🔄 새로고침", state='normal')
+        self.restore_button()
 
-    def auto_update(self):
-        """10분마다 자동 업데이트"""
-        self.update_weather_data()
-        # 600000ms = 10분
-        self.after(600000, self.auto_update)
+    def restore_button(self):
+        if self.is_updating:
+            self.is_updating = False
+            self.update_button.config(text="🔄 새로고침", state='normal')
 
     def run(self):
         """GUI 실행"""
-        self.mainloop()
+        try:
+            self.mainloop()
+        finally:
+            self.worker.shutdown()
@@ -0,0 +1,84 @@
+import os
+import sys
+import glob
+import time
+import base64
+import argparse
+import statistics
+from PIL import Image
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from ai.image_encoder import EncodeOptions, encode_image
+
+# (label, options) pairs compared by the benchmark
+SETTINGS = [
+    ("png-256 (previous default)", EncodeOptions(max_side=256, format="png")),
+    ("jpeg-256-q85", EncodeOptions(max_side=256, format="jpeg", quality=85)),
+    ("jpeg-256-q70", EncodeOptions(max_side=256, format="jpeg", quality=70)),
+    ("webp-256-q80", EncodeOptions(max_side=256, format="webp", quality=80)),
+    ("jpeg-256-gray", EncodeOptions(max_side=256, format="jpeg", quality=85, grayscale=True)),
+    ("jpeg-512-q85", EncodeOptions(max_side=512, format="jpeg", quality=85)),
+    ("jpeg-512-8KB", EncodeOptions(max_side=512, format="jpeg", quality=85, target_bytes=8 * 1024)),
+]
+
+def send_request(client, model, prompt, encoded):
+    """Send one request and return its end-to-end latency in seconds"""
+    contents = [{
+        "role": "user",
+        "parts": [
+            {"text": prompt},
+            {"inline_data": {"mime_type": encoded.mime_type, "data": base64.b64encode(encoded.data).decode()}}
+        ]
+    }]
+    start = time.perf_counter()
+    client.models.generate_content(model=model, contents=contents)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare payload size and request latency per encoding setting")
+    parser.add_argument('--images', default=os.path.join(os.path.dirname(__file__), 'images'),
+                        help='Directory with sample images (default: ./images)')
+    parser.add_argument('--repeat', type=int, default=5, help='Encode repetitions per image (default: 5)')
+    parser.add_argument('--requests', action='store_true', help='Also send each payload to Gemini and time it')
+    parser.add_argument('--prompt', default="which cells of this 2x3 box are empty and which are full")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.images, '*.jpg')) + glob.glob(os.path.join(args.images, '*.png')))
+    if not paths:
+        print(f"❌ No images found in {args.images}")
+        sys.exit(1)
+    images = [Image.open(path).convert('RGB') for path in paths]
+
+    client = None
+    model = "gemini-2.0-flash-exp"
+    if args.requests:
+        from google import genai
+        from dotenv import load_dotenv
+        load_dotenv()
+        client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"), http_options={"api_version": "v1alpha"})
+
+    print(f"📸 {len(paths)} images: {', '.join(os.path.basename(p) for p in paths)}")
+    header = f"{'setting':<28}{'avg bytes':>12}{'encode ms':>12}"
+    if client:
+        header += f"{'request s':>12}"
+    print(header)
+    print("-" * len(header))
+
+    for label, options in SETTINGS:
+        sizes, encode_times, latencies = [], [], []
+        for image in images:
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                encoded = encode_image(image, options)
+                encode_times.append((time.perf_counter() - start) * 1000)
+            sizes.append(len(encoded.data))
+            if client:
+                latencies.append(send_request(client, model, args.prompt, encoded))
+
+        line = f"{label:<28}{statistics.mean(sizes):>12,.0f}{statistics.median(encode_times):>12.1f}"
+        if client:
+            line += f"{statistics.mean(latencies):>12.2f}"
+        print(line)
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,21 @@ import sys
 import base64
 import warnings
 import argparse
-from io import BytesIO
+import asyncio
+import glob
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
 from google import genai
 from dotenv import load_dotenv
 from PIL import Image
 from datetime import datetime
 
+# Allow importing shared modules from the repository root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from ai.image_encoder import EncodeOptions, ImageEncoder, encode_image
+from ai.result_cache import AnalysisCache, cache_key, perceptual_hash
+
 # Suppress pydantic warnings
 warnings.filterwarnings("ignore", category=UserWarning, module="pydantic")
 
@@ -16,77 +25,90 @@ warnings.filterwarnings("ignore", category=UserWarning, module="pydantic")
 load_dotenv()
 
 class SimpleGeminiAnalyzer:
-    def __init__(self):
+    def __init__(self, encode_options=None):
         # Initialize client with API key
-        api_key = os.getenv("GEMINI_API_KEY")
+        # Point at the local upstream simulator when configured
+        simulator_url = os.getenv("UPSTREAM_SIMULATOR_URL")
+        api_key = os.getenv("GEMINI_API_KEY") or (simulator_url and "simulator")
         if not api_key:
             raise ValueError("GEMINI_API_KEY not found")
         
+        http_options = {"api_version": "v1alpha"}
+        if simulator_url:
+            http_options["base_url"] = simulator_url
         self.client = genai.Client(
             api_key=api_key,
-            http_options={"api_version": "v1alpha"}
+            http_options=http_options
         )
         self.model = "gemini-2.0-flash-exp"
-    
-    def resize_image_by_long_side(self, image, max_length=256):
-        """Resize image based on longer side while keeping aspect ratio"""
-        width, height = image.size
-        
-        # Skip resize if image is already smaller
-        if max(width, height) <= max_length:
-            return image
         
-        if width > height:
-            new_width = max_length
-            new_height = int(height * max_length / width)
-        else:
-            new_height = max_length
-            new_width = int(width * max_length / height)
+        # Result cache keyed on image hash, prompt and model
+        self.cache = AnalysisCache(
+            max_entries=int(os.getenv("ANALYSIS_CACHE_SIZE", "256")),
+            ttl=int(os.getenv("ANALYSIS_CACHE_TTL", str(24 * 3600))),
+            path=os.getenv("ANALYSIS_CACHE_FILE") or None
+        )
         
-        return image.resize((new_width, new_height), Image.LANCZOS)
+        # Shared preprocessing: 256px long side, JPEG unless configured otherwise
+        self.encoder = ImageEncoder(encode_options or EncodeOptions(max_side=256))
+    
+    def build_contents(self, prompt, encoded):
+        """Request content with the prompt and one inline image"""
+        return [{
+            "role": "user",
+            "parts": [
+                {"text": prompt},
+                {
+                    "inline_data": {
+                        "mime_type": encoded.mime_type,
+                        "data": base64.b64encode(encoded.data).decode()
+                    }
+                }
+            ]
+        }]
     
     def analyze_image(self, image_path, prompt):
         """Analyze image with custom prompt"""
         try:
-            # Load and resize image to 256px
             image = Image.open(image_path)
             original_size = image.size
-            image = self.resize_image_by_long_side(image)
-            resized_size = image.size
-            
-            # Encode image
-            buffered = BytesIO()
-            image.save(buffered, format="PNG")
-            image_data = base64.b64encode(buffered.getvalue()).decode()
             
-            # Create request content
-            contents = [{
-                "role": "user",
-                "parts": [
-                    {"text": prompt},
-                    {
-                        "inline_data": {
-                            "mime_type": "image/png",
-                            "data": image_data
-                        }
+            # Return cached result for the same image and prompt
+            key = cache_key(perceptual_hash(image), prompt, self.model)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return {
+                    "success": True,
+                    "result": cached,
+                    "cached": True,
+                    "image_info": {
+                        "original_size": original_size,
+                        "file_path": image_path
                     }
-                ]
-            }]
+                }
+            
+            # Resize and encode within the configured format and byte budget
+            encoded = self.encoder.encode(image, key=(image_path, os.path.getmtime(image_path)))
+            image_info = {
+                "original_size": original_size,
+                "resized_size": encoded.size,
+                "encoded_bytes": len(encoded.data),
+                "mime_type": encoded.mime_type,
+                "file_path": image_path
+            }
             
             # Send request
             response = self.client.models.generate_content(
                 model=self.model,
-                contents=contents
+                contents=self.build_contents(prompt, encoded)
             )
             
+            self.cache.put(key, response.text)
+            
             return {
                 "success": True,
                 "result": response.text,
-                "image_info": {
-                    "original_size": original_size,
-                    "resized_size": resized_size,
-                    "file_path": image_path
-                }
+                "image_info": image_info
             }
             
         except Exception as e:
@@ -98,6 +120,120 @@ class SimpleGeminiAnalyzer:
                 }
             }
 
+def prepare_image(image_path, options):
+    """Decode, hash and encode one image (runs in a worker process)"""
+    image = Image.open(image_path)
+    original_size = image.size
+    image_hash = perceptual_hash(image)
+    return original_size, image_hash, encode_image(image, options)
+
+class RateLimiter:
+    """Space out request starts to at most `rate` per second"""
+    
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_time = 0.0
+        self.lock = asyncio.Lock()
+    
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self.lock:
+            now = time.monotonic()
+            delay = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+def collect_batch_paths(pattern):
+    """Expand a directory or glob pattern into a sorted list of image files"""
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "**", "*")
+    extensions = (".jpg", ".jpeg", ".png", ".webp")
+    return sorted(p for p in glob.glob(pattern, recursive=True) if p.lower().endswith(extensions))
+
+def load_checkpoint(path):
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, "r", encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+async def run_batch(analyzer, paths, prompt, output, checkpoint_path, workers, concurrency, rate):
+    """Analyze many images, streaming one JSONL record per image as it completes"""
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(rate)
+    checkpoint = open(checkpoint_path, "a", encoding="utf-8") if checkpoint_path else None
+    stats = {"ok": 0, "cached": 0, "failed": 0}
+    
+    async def process(pool, image_path):
+        record = {"file": image_path}
+        try:
+            original_size, image_hash, encoded = await loop.run_in_executor(
+                pool, prepare_image, image_path, analyzer.encoder.options
+            )
+            record.update(original_size=original_size, encoded_bytes=len(encoded.data))
+            
+            key = cache_key(image_hash, prompt, analyzer.model)
+            cached = analyzer.cache.get(key)
+            if cached is not None:
+                record.update(success=True, cached=True, result=cached)
+                stats["cached"] += 1
+            else:
+                async with semaphore:
+                    await limiter.wait()
+                    start = time.monotonic()
+                    response = await analyzer.client.aio.models.generate_content(
+                        model=analyzer.model,
+                        contents=analyzer.build_contents(prompt, encoded)
+                    )
+                    record["latency"] = round(time.monotonic() - start, 3)
+                analyzer.cache.put(key, response.text)
+                record.update(success=True, cached=False, result=response.text)
+                stats["ok"] += 1
+        except Exception as e:
+            record.update(success=False, error=str(e))
+            stats["failed"] += 1
+        
+        output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        output.flush()
+        # Only completed images are checkpointed so failures are retried on resume
+        if checkpoint and record["success"]:
+            checkpoint.write(image_path + "\n")
+            checkpoint.flush()
+    
+    start = time.monotonic()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            await asyncio.gather(*(process(pool, p) for p in paths))
+    finally:
+        if checkpoint:
+            checkpoint.close()
+    
+    return stats, time.monotonic() - start
+
+def main_batch(args, analyzer):
+    """Batch mode entry point: --batch DIR_OR_GLOB"""
+    paths = collect_batch_paths(args.batch)
+    done = load_checkpoint(args.checkpoint)
+    pending = [p for p in paths if p not in done]
+    print(f"📂 {len(paths)} images found, {len(paths) - len(pending)} already done, {len(pending)} to analyze",
+          file=sys.stderr)
+    
+    output = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    try:
+        stats, elapsed = asyncio.run(run_batch(
+            analyzer, pending, args.prompt, output, args.checkpoint,
+            args.workers, args.concurrency, args.rate
+        ))
+    finally:
+        if args.output:
+            output.close()
+    
+    total = sum(stats.values())
+    print(f"✅ {total} images in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.2f} images/s) - "
+          f"requested {stats['ok']}, cached {stats['cached']}, failed {stats['failed']}", file=sys.stderr)
+
 def format_output(result):
     """Format analysis result for better readability"""
     print("\n" + "="*60)
@@ -109,8 +245,12 @@ def format_output(result):
         img_info = result["image_info"]
         print(f"📁 File: {img_info['file_path']}")
         print(f"📏 Original Size: {img_info['original_size'][0]}x{img_info['original_size'][1]}")
-        print(f"🔧 Resized To: {img_info['resized_size'][0]}x{img_info['resized_size'][1]}")
+        if "resized_size" in img_info:
+            print(f"🔧 Resized To: {img_info['resized_size'][0]}x{img_info['resized_size'][1]}")
+            print(f"📦 Payload: {img_info['encoded_bytes']:,} bytes ({img_info['mime_type']})")
         print(f"⏰ Analysis Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        if result.get("cached"):
+            print("💾 Served from local cache")
         
         print("\n" + "-"*60)
         print("📋 ANALYSIS RESULT:")
@@ -158,6 +298,7 @@ Examples:
   python main.py --image ./images/shelf.jpg
   python main.py -i ./images/box.png
   python main.py --image ./test.jpg --prompt "Describe this image"
+  python main.py --batch ./archive --output results.jsonl --checkpoint done.txt
         """
     )
     
@@ -175,18 +316,41 @@ Examples:
         help='Custom prompt for image analysis'
     )
     
+    parser.add_argument('--max-side', type=int, default=256, help='Longest side in pixels (default: 256)')
+    parser.add_argument('--format', choices=['jpeg', 'webp', 'png'], default='jpeg', help='Encoding format (default: jpeg)')
+    parser.add_argument('--quality', type=int, default=85, help='Starting quality for JPEG/WebP (default: 85)')
+    parser.add_argument('--target-bytes', type=int, default=None, help='Lower quality until the payload fits this many bytes')
+    parser.add_argument('--grayscale', action='store_true', help='Send a grayscale image')
+    
+    parser.add_argument('--batch', '-b', type=str, help='Analyze every image in a directory or glob pattern')
+    parser.add_argument('--output', '-o', type=str, help='Append JSONL records to this file (default: stdout)')
+    parser.add_argument('--checkpoint', type=str, help='File of completed images; reruns skip them')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Decode/resize processes (default: CPU count)')
+    parser.add_argument('--concurrency', type=int, default=4, help='Requests in flight (default: 4)')
+    parser.add_argument('--rate', type=float, default=0, help='Max requests per second (default: unlimited)')
+    
     # Parse arguments
     args = parser.parse_args()
     
     # Validate image file exists
-    if not os.path.exists(args.image):
+    if not args.batch and not os.path.exists(args.image):
         print(f"❌ Error: Image file '{args.image}' not found!")
         sys.exit(1)
     
     try:
         # Initialize analyzer
-        print("🚀 Initializing Gemini Analyzer...")
-        analyzer = SimpleGeminiAnalyzer()
+        print("🚀 Initializing Gemini Analyzer...", file=sys.stderr if args.batch else sys.stdout)
+        analyzer = SimpleGeminiAnalyzer(EncodeOptions(
+            max_side=args.max_side,
+            format=args.format,
+            quality=args.quality,
+            target_bytes=args.target_bytes,
+            grayscale=args.grayscale
+        ))
+        
+        if args.batch:
+            main_batch(args, analyzer)
+            return
         
         print(f"📸 Analyzing image: {args.image}")
         print("⏳ Please wait...")
@@ -1,69 +1,124 @@
+import time
+START = time.perf_counter()
+
+import argparse
 import asyncio
 import threading
-import time
 from config.settings import Settings
 from events.event_bus import EventBus
-from weather.weather_service import WeatherService
-from sensors.pir_sensor import PIRSensor
-from actuators.actuator_controller import ActuatorController
-from camera.camera_service import CameraService
-from ai.gemini_service import GeminiService
-from gui.weather_gui import WeatherGUI
-from utils.logger import setup_logger
-
-# 전역 변수로 이벤트 버스와 루프 공유
-shared_event_bus = None
-background_loop = None
-
-def start_background_services():
-    """백그라운드 서비스들을 별도 스레드에서 실행"""
-    global shared_event_bus, background_loop
-    
-    background_loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(background_loop)
-    
-    settings = Settings()
-    logger = setup_logger(settings.LOG_LEVEL)
+from startup.orchestrator import StartupOrchestrator, lazy
+from utils.logger import get_logger, setup_logger, shutdown_logger
 
-    # Initialize services with shared event bus
-    weather = WeatherService(shared_event_bus, settings)
-    pir = PIRSensor(shared_event_bus, settings)
-    actuator = ActuatorController(shared_event_bus, settings)
-    camera = CameraService(shared_event_bus, settings)
-    gemini = GeminiService(shared_event_bus, settings)
+log = get_logger(__name__)
 
-    print("백그라운드 서비스 시작됨")
+def build_orchestrator(event_bus, settings, headless=False):
+    """서비스와 의존성 선언 - cv2, google.generativeai 등은 각 서비스 생성 시점에 import"""
+    orchestrator = StartupOrchestrator(origin=START)
 
-    # Start services
-    tasks = [
-        weather.start(),
-        pir.start(),
-        actuator.start()
-    ]
+    # 첫 날씨 스냅샷을 받아야 하는 구독자는 날씨 서비스보다 먼저 준비
+    weather_deps = []
+    if settings.SNAPSHOT_API_PORT:
+        orchestrator.add('snapshot_api', lazy('api.snapshot_server', 'SnapshotServer', event_bus, settings),
+                         run='start')
+        weather_deps.append('snapshot_api')
+    if headless:
+        orchestrator.add('dashboard', lazy('gui.headless_renderer', 'HeadlessDashboard', event_bus, settings))
+        weather_deps.append('dashboard')
+
+    if settings.METRICS_PORT or settings.METRICS_SNAPSHOT_FILE:
+        orchestrator.add('metrics', lazy('api.metrics_exporter', 'MetricsExporter', settings), run='start')
+
+    orchestrator.add('weather', lazy('weather.weather_service', 'WeatherService', event_bus, settings),
+                     deps=weather_deps, init='refresh_snapshot', run='start')
+    orchestrator.add('actuator', lazy('actuators.actuator_controller', 'ActuatorController', event_bus, settings),
+                     init='start')
+    orchestrator.add('camera', lazy('camera.camera_service', 'CameraService', event_bus, settings),
+                     init='warm_up')
+    orchestrator.add('gemini', lazy('ai.gemini_service', 'GeminiService', event_bus, settings))
+    # PIR 이벤트는 이벤트 흐름의 모든 구독자가 준비된 뒤에 발생시킴
+    orchestrator.add('pir', lazy('sensors.pir_sensor', 'PIRSensor', event_bus, settings),
+                     deps=['weather', 'actuator', 'camera', 'gemini'], run='start')
+    return orchestrator
+
+def start_background_services(orchestrator, loop, booted):
+    """백그라운드 서비스들을 별도 스레드의 이벤트 루프에서 실행"""
+    asyncio.set_event_loop(loop)
+
+    async def run():
+        await orchestrator.boot()
+        log.info("백그라운드 서비스 시작됨")
+        booted.set()
+        if orchestrator.tasks:
+            await asyncio.gather(*orchestrator.tasks)
 
     try:
-        background_loop.run_until_complete(asyncio.gather(*tasks))
-    except Exception as e:
-        print(f"백그라운드 서비스 에러: {e}")
+        loop.run_until_complete(run())
+    except Exception:
+        log.exception("백그라운드 서비스 에러")
+
+def run_headless(settings, event_bus, profile):
+    """Tk 없이 프레임버퍼/PNG 로 대시보드를 그리며 백그라운드 서비스를 메인 스레드에서 실행"""
+    orchestrator = build_orchestrator(event_bus, settings, headless=True)
+    log.info("헤드리스 대시보드 출력", output=settings.HEADLESS_OUTPUT)
+
+    booted = threading.Event()
+    if profile:
+        def report():
+            booted.wait()
+            print(orchestrator.report())
+        threading.Thread(target=report, daemon=True).start()
+    start_background_services(orchestrator, asyncio.new_event_loop(), booted)
 
 def main():
-    global shared_event_bus, background_loop
-    
+    parser = argparse.ArgumentParser(description="날씨 보관함 키오스크")
+    parser.add_argument('--headless', action='store_true', help='Tk 대신 프레임버퍼/PNG 로 화면 출력')
+    parser.add_argument('--startup-profile', action='store_true', help='서비스별 시작 소요 시간 출력')
+    args = parser.parse_args()
+
     settings = Settings()
-    
+    setup_logger(settings.LOG_LEVEL)
+
     # 공유 이벤트 버스 생성
     shared_event_bus = EventBus()
 
-    # 백그라운드 서비스를 별도 스레드에서 시작
-    background_thread = threading.Thread(target=start_background_services, daemon=True)
+    if args.headless:
+        try:
+            run_headless(settings, shared_event_bus, args.startup_profile)
+        finally:
+            shutdown_logger()
+        return
+
+    # 루프 객체를 먼저 만들어 넘기므로 GUI 는 루프가 돌기 시작할 때까지 기다릴 필요 없음
+    background_loop = asyncio.new_event_loop()
+    orchestrator = build_orchestrator(shared_event_bus, settings)
+    booted = threading.Event()
+    background_thread = threading.Thread(
+        target=start_background_services, args=(orchestrator, background_loop, booted), daemon=True
+    )
     background_thread.start()
-    
-    # 백그라운드 루프가 준비될 때까지 잠시 대기
-    time.sleep(1)
 
-    # GUI는 메인 스레드에서 실행 (공유 이벤트 버스 사용)
-    gui = WeatherGUI(shared_event_bus, background_loop)
+    # GUI는 메인 스레드에서 서비스 초기화와 동시에 생성 (첫 스냅샷은 뷰 모델이 받아 반영)
+    from gui.weather_gui import WeatherGUI
+    orchestrator.mark('gui import')
+    gui = WeatherGUI(shared_event_bus, background_loop, startup=orchestrator,
+                     icon_atlas_path=settings.ICON_ATLAS_PATH)
+    orchestrator.mark('gui built')
+
+    if args.startup_profile:
+        def first_frame():
+            orchestrator.mark('gui shown')
+            report_when_booted()
+
+        def report_when_booted():
+            if booted.is_set():
+                print(orchestrator.report())
+            else:
+                gui.after(100, report_when_booted)
+
+        gui.after_idle(first_frame)
+
     gui.run()
+    shutdown_logger()
 
 if __name__ == "__main__":
     main()
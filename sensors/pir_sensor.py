@@ -6,6 +6,13 @@ except ImportError:
 
 from config.settings import Settings
 from events.event_types import Event, EventType
+from utils import metrics
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+TRANSITIONS = metrics.counter('pir_transitions', 'PIR 상태 변화 (come, out)', ('state',))
+PRESENT = metrics.gauge('pir_present', '현재 사람 감지 여부')
 
 class PIRSensor:
     def __init__(self, event_bus, settings: Settings):
@@ -21,8 +28,15 @@ class PIRSensor:
             state = GPIO.input(self.settings.PIR_PIN) if GPIO else False  # Simulate if no GPIO
             if state and not self.present:
                 self.present = True
+                # 센서가 떨리면 초당 여러 번 바뀔 수 있어 기록은 호출 위치마다 1초에 한 번
+                log.debug("사람 감지", every=1)
+                TRANSITIONS.labels('come').inc()
+                PRESENT.set(1)
                 await self.event_bus.emit(Event(EventType.HUMAN_COME, {}))
             elif not state and self.present:
                 self.present = False
+                log.debug("사람 떠남", every=1)
+                TRANSITIONS.labels('out').inc()
+                PRESENT.set(0)
                 await self.event_bus.emit(Event(EventType.HUMAN_OUT, {}))
             await asyncio.sleep(0.1)
@@ -0,0 +1,270 @@
+import argparse
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# 경로 -> 서비스 이름 (기상청 3개, 에어코리아 1개)
+WEATHER_ENDPOINTS = {
+    '/1360000/VilageFcstInfoService_2.0/getUltraSrtNcst': 'nowcast',
+    '/1360000/VilageFcstInfoService_2.0/getVilageFcst': 'forecast',
+    '/1360000/LivingWthrIdxServiceV4/getUVIdxV4': 'uv',
+    '/B552584/ArpltnInforInqireSvc/getMsrstnAcctoRltmMesureDnsty': 'air',
+}
+GEMINI_PATTERN = re.compile(r'^/v1(?:beta|alpha)?/models/([^:/]+):(generateContent|streamGenerateContent)$')
+
+class LatencyModel:
+    """'fixed:ms', 'uniform:lo,hi', 'lognormal:median_ms,sigma' 형식의 지연시간 분포"""
+
+    def __init__(self, spec, rng):
+        self.rng = rng
+        kind, _, args = spec.partition(':')
+        self.kind = kind
+        self.args = [float(a) for a in args.split(',')] if args else [0.0]
+
+    def sample(self):
+        if self.kind == 'uniform':
+            return self.rng.uniform(self.args[0], self.args[1]) / 1000
+        if self.kind == 'lognormal':
+            median, sigma = self.args
+            return median * math.exp(self.rng.gauss(0, sigma)) / 1000
+        return self.args[0] / 1000
+
+class ServiceProfile:
+    """서비스별 지연시간, 오류율, 초당 요청 제한"""
+
+    def __init__(self, latency, error_rate, rate_limit, rng):
+        self.latency = LatencyModel(latency, rng)
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rng = rng
+        self._lock = threading.Lock()
+        self._tokens = rate_limit
+        self._refilled = time.monotonic()
+
+    def throttled(self):
+        """토큰 버킷 - 초당 rate_limit 개를 넘으면 True"""
+        if not self.rate_limit:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._refilled) * self.rate_limit)
+            self._refilled = now
+            if self._tokens < 1:
+                return True
+            self._tokens -= 1
+            return False
+
+    def fails(self):
+        with self._lock:
+            return self.rng.random() < self.error_rate
+
+class UpstreamSimulator:
+    """기상청/에어코리아 XML과 Gemini 응답을 흉내 내는 로컬 서버 상태"""
+
+    def __init__(self, fixtures=None, seed=0, default_profile=None, profiles=None):
+        self.fixtures = fixtures
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        default_profile = default_profile or {}
+        self.profiles = {}
+        for name in ('nowcast', 'forecast', 'uv', 'air', 'gemini'):
+            options = dict(default_profile)
+            options.update((profiles or {}).get(name, {}))
+            self.profiles[name] = ServiceProfile(
+                options.get('latency', 'fixed:0'),
+                float(options.get('error_rate', 0)),
+                float(options.get('rate_limit', 0)),
+                random.Random(self.rng.random())
+            )
+        self.counts = {name: 0 for name in self.profiles}
+
+    def fixture(self, name):
+        """녹화된 응답 파일이 있으면 그대로 사용"""
+        if not self.fixtures:
+            return None
+        for extension in ('.xml', '.json'):
+            path = os.path.join(self.fixtures, name + extension)
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    return f.read()
+        return None
+
+    def random_value(self, low, high):
+        with self.rng_lock:
+            return self.rng.randint(low, high)
+
+    def weather_xml(self, name):
+        recorded = self.fixture(name)
+        if recorded is not None:
+            return recorded
+
+        if name == 'nowcast':
+            values = {'T1H': self.random_value(-5, 32), 'RN1': 0, 'PTY': 0, 'REH': self.random_value(20, 90)}
+            items = ''.join(
+                f"<item><category>{k}</category><obsrValue>{v}</obsrValue></item>" for k, v in values.items()
+            )
+        elif name == 'forecast':
+            low = self.random_value(-8, 22)
+            values = {'POP': self.random_value(0, 10) * 10, 'TMN': low, 'TMX': low + self.random_value(3, 12),
+                      'REH': self.random_value(20, 90), 'SKY': self.rng.choice([1, 3, 4])}
+            items = ''.join(
+                f"<item><category>{k}</category><fcstValue>{v}</fcstValue></item>" for k, v in values.items()
+            )
+        elif name == 'uv':
+            items = f"<item><date>{datetime.now():%Y%m%d%H}</date><h0>{self.random_value(0, 11)}</h0></item>"
+        else:
+            items = f"<item><pm10Value>{self.random_value(5, 150)}</pm10Value><pm10Grade>{self.random_value(1, 4)}</pm10Grade></item>"
+
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?><response><header><resultCode>00</resultCode>'
+            f'<resultMsg>NORMAL_SERVICE</resultMsg></header><body><items>{items}</items></body></response>'
+        )
+
+    def gemini_text(self):
+        recorded = self.fixture('gemini')
+        if recorded is not None:
+            return recorded
+        slots = [{'slot': i + 1, 'occupied': self.random_value(0, 3) > 0, 'confidence': 0.9} for i in range(6)]
+        return json.dumps({'slots': slots})
+
+def gemini_body(text):
+    return {
+        'candidates': [{'content': {'role': 'model', 'parts': [{'text': text}]}, 'finishReason': 'STOP', 'index': 0}],
+        'usageMetadata': {'promptTokenCount': 0, 'candidatesTokenCount': 0, 'totalTokenCount': 0}
+    }
+
+def make_handler(simulator):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            path = urlparse(self.path).path
+            name = WEATHER_ENDPOINTS.get(path)
+            if name is None:
+                return self.send_body(404, 'text/plain', b'not found')
+            if self.apply_faults(name):
+                return
+            self.send_body(200, 'application/xml;charset=UTF-8', simulator.weather_xml(name).encode('utf-8'))
+
+        def do_POST(self):
+            # 요청 본문은 읽고 버림
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            url = urlparse(self.path)
+            match = GEMINI_PATTERN.match(url.path)
+            if match is None:
+                return self.send_body(404, 'text/plain', b'not found')
+            if self.apply_faults('gemini'):
+                return
+
+            text = simulator.gemini_text()
+            if match.group(2) == 'streamGenerateContent':
+                # 실제 API 와 같이 alt=sse 요청만 SSE, 나머지는 JSON 배열 (google-generativeai REST 전송)
+                query = parse_qs(url.query)
+                sse = 'sse' in query.get('alt', []) + query.get('$alt', [])
+                return self.send_stream(text, sse=sse)
+            self.send_body(200, 'application/json', json.dumps(gemini_body(text)).encode('utf-8'))
+
+        def apply_faults(self, name):
+            """요청 수 제한, 지연시간, 오류 주입 - 응답을 이미 보냈으면 True"""
+            profile = simulator.profiles[name]
+            simulator.counts[name] += 1
+            if profile.throttled():
+                self.send_body(429, 'application/json', b'{"error": {"code": 429, "status": "RESOURCE_EXHAUSTED"}}')
+                return True
+            time.sleep(profile.latency.sample())
+            if profile.fails():
+                self.send_body(500, 'application/json', b'{"error": {"code": 500, "status": "INTERNAL"}}')
+                return True
+            return False
+
+        def send_body(self, status, content_type, body):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def send_stream(self, text, chunks=4, sse=False):
+            """응답 텍스트를 여러 조각으로 나눠 전송 - SSE 이벤트 또는 chunked JSON 배열의 원소"""
+            self.send_response(200)
+            if sse:
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Connection', 'close')
+            else:
+                self.send_header('Content-Type', 'application/json; charset=UTF-8')
+                self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            size = max(1, len(text) // chunks + 1)
+            gemini = simulator.profiles['gemini']
+            for index, start in enumerate(range(0, len(text), size)):
+                event = json.dumps(gemini_body(text[start:start + size]))
+                if sse:
+                    self.wfile.write(f"data: {event}\r\n\r\n".encode('utf-8'))
+                else:
+                    self.write_chunk(('[' if index == 0 else ',\r\n') + event)
+                self.wfile.flush()
+                time.sleep(gemini.latency.sample() / chunks)
+            if sse:
+                self.close_connection = True
+            else:
+                self.write_chunk(']' if text else '[]')
+                self.wfile.write(b'0\r\n\r\n')
+                self.wfile.flush()
+
+        def write_chunk(self, data):
+            body = data.encode('utf-8')
+            self.wfile.write(f"{len(body):x}\r\n".encode('ascii') + body + b'\r\n')
+
+    return Handler
+
+def serve(host='127.0.0.1', port=8081, **options):
+    """시뮬레이터 서버 생성 후 백그라운드 스레드에서 실행 (server.shutdown() 으로 종료)"""
+    simulator = UpstreamSimulator(**options)
+    server = ThreadingHTTPServer((host, port), make_handler(simulator))
+    server.simulator = simulator
+    threading.Thread(target=server.serve_forever, name='upstream-simulator', daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="기상청/에어코리아/Gemini 로컬 시뮬레이터")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--fixtures', help='녹화된 응답 디렉토리 (nowcast.xml, forecast.xml, uv.xml, air.xml, gemini.json)')
+    parser.add_argument('--seed', type=int, default=0, help='합성 응답과 지연시간 난수 시드')
+    parser.add_argument('--latency', default='fixed:0', help="예: fixed:50, uniform:20,200, lognormal:150,0.5")
+    parser.add_argument('--error-rate', type=float, default=0.0, help='500 응답 비율 (0~1)')
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='서비스별 초당 요청 수 제한 (0이면 없음)')
+    parser.add_argument('--profiles', help='서비스별 설정 JSON 파일, 예: {"gemini": {"latency": "lognormal:1500,0.4"}}')
+    args = parser.parse_args()
+
+    profiles = None
+    if args.profiles:
+        with open(args.profiles, 'r', encoding='utf-8') as f:
+            profiles = json.load(f)
+
+    server = serve(
+        args.host, args.port, fixtures=args.fixtures, seed=args.seed,
+        default_profile={'latency': args.latency, 'error_rate': args.error_rate, 'rate_limit': args.rate_limit},
+        profiles=profiles
+    )
+    print(f"업스트림 시뮬레이터 실행 중: http://{args.host}:{args.port}")
+    print(f"서비스 연결: UPSTREAM_SIMULATOR_URL=http://{args.host}:{args.port}")
+    try:
+        while True:
+            time.sleep(60)
+            print(f"요청 수: {server.simulator.counts}")
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
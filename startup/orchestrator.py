@@ -0,0 +1,111 @@
+import asyncio
+import importlib
+import time
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+def lazy(module_name, attr, *args, **kwargs):
+    """생성 시점에 모듈을 import 하는 팩토리 (cv2, google.generativeai 등 무거운 의존성 지연 로드)"""
+    def factory():
+        return getattr(importlib.import_module(module_name), attr)(*args, **kwargs)
+    return factory
+
+class ServiceSpec:
+    def __init__(self, name, factory, deps=(), init=None, run=None):
+        self.name = name
+        self.factory = factory      # 인스턴스 생성 (import 포함, 스레드에서 실행)
+        self.deps = tuple(deps)     # 먼저 준비되어야 하는 서비스 이름
+        self.init = init            # 준비 완료 전에 기다리는 초기화 메서드 이름 (코루틴)
+        self.run = run              # 준비 완료 후 계속 실행되는 메서드 이름 (코루틴)
+        self.instance = None
+        self.ready = None           # asyncio.Future - 성공 시 True, 실패 시 False
+        self.timings = {}
+        self.error = None
+
+class StartupOrchestrator:
+    """서비스 의존성과 준비 상태를 관리하며 서로 독립적인 초기화를 동시에 실행"""
+
+    def __init__(self, origin=None):
+        # 프로파일 기준 시각 (기본: 오케스트레이터 생성 시각)
+        self.origin = origin if origin is not None else time.perf_counter()
+        self.specs = {}
+        self.tasks = []
+        self.marks = []
+
+    def add(self, name, factory, deps=(), init=None, run=None):
+        self.specs[name] = ServiceSpec(name, factory, deps, init, run)
+
+    def get(self, name):
+        return self.specs[name].instance
+
+    def future(self, name):
+        spec = self.specs[name]
+        if spec.ready is None:
+            spec.ready = asyncio.get_running_loop().create_future()
+        return spec.ready
+
+    async def wait_ready(self, name):
+        """서비스 준비(또는 실패)까지 대기 - 다른 스레드에서는 run_coroutine_threadsafe 로 호출"""
+        return await self.future(name)
+
+    def mark(self, label):
+        """서비스 외 구간(GUI 생성 등) 기록"""
+        self.marks.append((label, self.elapsed()))
+
+    def elapsed(self):
+        return (time.perf_counter() - self.origin) * 1000
+
+    async def boot(self):
+        """모든 서비스를 의존성 순서대로, 독립적인 것은 동시에 준비"""
+        for name in self.specs:
+            self.future(name)
+        await asyncio.gather(*(self.start_service(spec) for spec in self.specs.values()))
+
+    async def start_service(self, spec):
+        loop = asyncio.get_running_loop()
+        # 의존 서비스가 실패해도 나머지는 계속 시작 (원인은 로그로 남김)
+        for dep in spec.deps:
+            if not await self.wait_ready(dep):
+                log.warning("의존 서비스 시작 실패 - 계속 진행", service=spec.name, dependency=dep)
+        spec.timings['deps'] = self.elapsed()
+
+        try:
+            # 무거운 import 와 생성자의 블로킹 작업은 이벤트 루프 밖에서
+            spec.instance = await loop.run_in_executor(None, spec.factory)
+            spec.timings['built'] = self.elapsed()
+            if spec.init:
+                await getattr(spec.instance, spec.init)()
+            spec.timings['ready'] = self.elapsed()
+            spec.ready.set_result(True)
+        except Exception as e:
+            spec.error = e
+            spec.timings['ready'] = self.elapsed()
+            log.error("서비스 시작 실패", service=spec.name, error=e)
+            spec.ready.set_result(False)
+            return
+
+        if spec.run:
+            self.tasks.append(asyncio.create_task(self.run_service(spec)))
+
+    async def run_service(self, spec):
+        try:
+            await getattr(spec.instance, spec.run)()
+        except Exception:
+            log.exception("서비스 실행 오류", service=spec.name)
+
+    def report(self):
+        """--startup-profile 출력 - 서비스별 대기/생성(import)/초기화 시간 (ms, 시작 기준)"""
+        lines = [f"{'service':<12}{'deps ok':>10}{'built':>10}{'ready':>10}{'build':>10}{'init':>10}  status"]
+        for spec in sorted(self.specs.values(), key=lambda s: s.timings.get('ready', float('inf'))):
+            t = spec.timings
+            deps, built, ready = t.get('deps'), t.get('built'), t.get('ready')
+            build = built - deps if built is not None and deps is not None else None
+            init = ready - built if ready is not None and built is not None else None
+            status = 'ok' if spec.error is None else f"failed: {spec.error}"
+            lines.append(f"{spec.name:<12}" + ''.join(
+                f"{value:>10.0f}" if value is not None else f"{'-':>10}" for value in (deps, built, ready, build, init)
+            ) + f"  {status}")
+        for label, at in self.marks:
+            lines.append(f"{label:<12}{at:>40.0f}")
+        return '\n'.join(lines)
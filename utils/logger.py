@@ -1,9 +1,105 @@
 import logging
+import queue
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
 
-def setup_logger(level=logging.INFO):
-    logger = logging.getLogger(__name__)
-    logger.setLevel(level)
-    handler = logging.StreamHandler()
-    handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-    logger.addHandler(handler)
-    return logger
+# 백그라운드 기록 스레드 (setup_logger 를 여러 번 호출해도 하나만 유지)
+_listener = None
+
+class KeyValueFormatter(logging.Formatter):
+    """메시지 뒤에 구조화된 필드를 key=value 로 붙이는 포매터 (기록 스레드에서만 실행)"""
+
+    def formatMessage(self, record):
+        line = super().formatMessage(record)
+        fields = getattr(record, 'fields', None)
+        if fields:
+            line += ' ' + ' '.join(f"{key}={format_value(value)}" for key, value in fields.items())
+        return line
+
+def format_value(value):
+    text = str(value)
+    return f'"{text}"' if ' ' in text or not text else text
+
+class DeferredQueueHandler(QueueHandler):
+    """호출한 스레드에서는 포맷하지 않고 레코드를 그대로 큐에 넣음 (같은 프로세스 안에서만 사용)"""
+
+    def prepare(self, record):
+        return record
+
+def setup_logger(level=logging.INFO, stream=None):
+    """루트 로거를 큐 -> 백그라운드 기록 스레드 구조로 설정 (다시 호출하면 레벨만 변경)"""
+    global _listener
+    root = logging.getLogger()
+    root.setLevel(level)
+    if _listener is not None:
+        return root
+
+    records = queue.SimpleQueue()
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(KeyValueFormatter('%(asctime)s %(levelname)s %(name)s - %(message)s'))
+    _listener = QueueListener(records, handler, respect_handler_level=True)
+    _listener.start()
+
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(DeferredQueueHandler(records))
+    return root
+
+def shutdown_logger():
+    """남은 레코드를 모두 기록하고 기록 스레드 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+class StructuredLogger:
+    """key=value 필드와 호출 위치별 속도 제한을 지원하는 로거
+
+    log.info("명령 전송", command=command) 처럼 사용하며, 레벨이 꺼져 있으면
+    레코드를 만들지 않고 바로 반환. every=초 를 주면 같은 호출 위치의 기록을 그 간격으로
+    제한하고 생략된 횟수는 다음 기록의 suppressed 필드로 남김
+    """
+
+    def __init__(self, name):
+        self.logger = logging.getLogger(name)
+        # (코드 객체, 줄 번호) -> (마지막 기록 시각, 생략 횟수)
+        self.sites = {}
+
+    def debug(self, msg, *args, every=0, **fields):
+        self._log(logging.DEBUG, msg, args, every, fields)
+
+    def info(self, msg, *args, every=0, **fields):
+        self._log(logging.INFO, msg, args, every, fields)
+
+    def warning(self, msg, *args, every=0, **fields):
+        self._log(logging.WARNING, msg, args, every, fields)
+
+    def error(self, msg, *args, every=0, **fields):
+        self._log(logging.ERROR, msg, args, every, fields)
+
+    def exception(self, msg, *args, every=0, **fields):
+        self._log(logging.ERROR, msg, args, every, fields, exc_info=True)
+
+    def is_enabled(self, level):
+        return self.logger.isEnabledFor(level)
+
+    def _log(self, level, msg, args, every, fields, exc_info=None):
+        if not self.logger.isEnabledFor(level):
+            return
+        if every:
+            caller = sys._getframe(2)
+            site = (caller.f_code, caller.f_lineno)
+            now = time.monotonic()
+            # 처음 기록하는 위치는 항상 기록 (monotonic 은 부팅 시점 기준이라 0 과 비교하면 안 됨)
+            entry = self.sites.get(site)
+            if entry is not None and now - entry[0] < every:
+                self.sites[site] = (entry[0], entry[1] + 1)
+                return
+            self.sites[site] = (now, 0)
+            if entry is not None and entry[1]:
+                fields['suppressed'] = entry[1]
+        self.logger.log(level, msg, *args, exc_info=exc_info, extra={'fields': fields}, stacklevel=3)
+
+def get_logger(name):
+    return StructuredLogger(name)
@@ -0,0 +1,228 @@
+import bisect
+import math
+import threading
+import time
+from array import array
+
+class Metric:
+    """라벨 값 조합마다 자식 시계열을 두는 지표 기본 클래스"""
+
+    kind = 'untyped'
+
+    def __init__(self, name, help, labelnames=(), registry=None):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        # 라벨 값 튜플 -> 자식 (라벨이 없으면 () 하나)
+        self.children = {}
+        (registry if registry is not None else REGISTRY).register(self)
+        # 라벨이 없는 지표는 값이 바뀌기 전에도 0 으로 노출
+        if not self.labelnames:
+            self.labels()
+
+    @property
+    def exposed_name(self):
+        return self.name
+
+    def labels(self, *values):
+        """라벨 값에 해당하는 자식 반환 (자주 쓰는 조합은 미리 받아 두면 조회 비용도 없음)"""
+        child = self.children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name}: 라벨 {self.labelnames} 필요, {values} 받음")
+            with self._lock:
+                child = self.children.setdefault(values, self.new_child())
+        return child
+
+    def label_text(self, values, extra=()):
+        pairs = list(zip(self.labelnames, values)) + list(extra)
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{key}="{escape(value)}"' for key, value in pairs) + '}'
+
+class CounterChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+class Counter(Metric):
+    kind = 'counter'
+    new_child = CounterChild
+
+    @property
+    def exposed_name(self):
+        return self.name + '_total'
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+    def samples(self):
+        for values, child in list(self.children.items()):
+            yield self.exposed_name, self.label_text(values), child.value
+
+class GaugeChild:
+    __slots__ = ('value', 'function')
+
+    def __init__(self):
+        self.value = 0.0
+        self.function = None
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+    def set_function(self, function):
+        """수집할 때마다 function() 값을 사용 (큐 길이, 캐시 적중 수 등)"""
+        self.function = function
+
+    def get(self):
+        return self.function() if self.function is not None else self.value
+
+class Gauge(Metric):
+    kind = 'gauge'
+    new_child = GaugeChild
+
+    def set(self, value):
+        self.labels().set(value)
+
+    def set_function(self, function):
+        self.labels().set_function(function)
+
+    def samples(self):
+        for values, child in list(self.children.items()):
+            yield self.name, self.label_text(values), child.get()
+
+class HistogramChild:
+    """고정 구간 개수를 array 로 보관 (마지막 칸은 +Inf)"""
+
+    __slots__ = ('bounds', 'counts', 'sum', '_lock')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = array('Q', bytes(8 * (len(bounds) + 1)))
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def time(self):
+        return Timer(self)
+
+class Histogram(Metric):
+    kind = 'histogram'
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS, registry=None):
+        self.bounds = tuple(sorted(buckets))
+        super().__init__(name, help, labelnames, registry)
+
+    def new_child(self):
+        return HistogramChild(self.bounds)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+    def samples(self):
+        for values, child in list(self.children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.bounds + (math.inf,), counts):
+                cumulative += count
+                le = '+Inf' if bound == math.inf else repr(float(bound))
+                yield self.name + '_bucket', self.label_text(values, [('le', le)]), cumulative
+            yield self.name + '_sum', self.label_text(values), total
+            yield self.name + '_count', self.label_text(values), cumulative
+
+class Timer:
+    """with histogram.labels(...).time(): 블록 실행 시간을 초 단위로 기록"""
+
+    __slots__ = ('child', 'start')
+
+    def __init__(self, child):
+        self.child = child
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.child.observe(time.perf_counter() - self.start)
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self.metrics:
+                raise ValueError(f"이미 등록된 지표: {metric.name}")
+            self.metrics[metric.name] = metric
+
+    def get(self, name):
+        return self.metrics.get(name)
+
+    def render(self):
+        """Prometheus 텍스트 형식 (version 0.0.4)"""
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.append(f"# HELP {metric.exposed_name} {escape_help(metric.help)}")
+            lines.append(f"# TYPE {metric.exposed_name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {format_number(value)}")
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self):
+        """JSON 으로 저장할 수 있는 {시계열 이름: 값} dict"""
+        return {name + labels: value for metric in list(self.metrics.values())
+                for name, labels, value in metric.samples()}
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def escape_help(text):
+    return text.replace('\\', '\\\\').replace('\n', '\\n')
+
+def format_number(value):
+    if isinstance(value, int):
+        return str(value)
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+# 프로세스 전체에서 공유하는 기본 레지스트리
+REGISTRY = Registry()
+
+def counter(name, help, labelnames=()):
+    """기본 레지스트리에 이미 있으면 그 지표를 반환 (모듈을 다시 import 해도 중복 등록 없음)"""
+    return REGISTRY.get(name) or Counter(name, help, labelnames)
+
+def gauge(name, help, labelnames=()):
+    return REGISTRY.get(name) or Gauge(name, help, labelnames)
+
+def histogram(name, help, labelnames=(), buckets=Histogram.DEFAULT_BUCKETS):
+    return REGISTRY.get(name) or Histogram(name, help, labelnames, buckets)
@@ -0,0 +1,147 @@
+import argparse
+import glob
+import json
+import os
+import time
+from xml.etree import ElementTree as ET
+import numpy as np
+from weather.history import WeatherHistory
+from weather.rules import DEFAULT_RULES, CompiledRules, columns_from_records, to_number
+
+# 단기예보(getVilageFcst) 항목 -> 규칙 필드 (시간별 예보 한 시각이 한 행, 미세먼지/자외선 항목은 없음)
+KMA_FIELDS = {'TMP': 'current_temp', 'POP': 'precipitation', 'REH': 'humidity', 'TMX': 'max_temp', 'TMN': 'min_temp'}
+
+def load_snapshots(path):
+    """JSON Lines 스냅샷 -> 열 배열 (한 줄: 날씨 데이터 dict 또는 /snapshot/weather 응답)"""
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                records.append(record.get('data', record))
+    names = set().union(*records) if records else set()
+    return columns_from_records(records, names), len(records)
+
+def load_kma(directory):
+    """녹화된 단기예보 XML -> 예보 시각별 열 배열 (같은 시각은 나중 파일 값 사용)"""
+    hours = {}
+    for path in sorted(glob.glob(os.path.join(directory, '*.xml'))):
+        for _, item in ET.iterparse(path):
+            if item.tag != 'item':
+                continue
+            name = KMA_FIELDS.get(item.findtext('category'))
+            if name is not None:
+                key = (item.findtext('fcstDate'), item.findtext('fcstTime'))
+                hours.setdefault(key, {})[name] = to_number(name, item.findtext('fcstValue'))
+            item.clear()
+
+    keys = sorted(hours)
+    columns = {name: np.array([hours[key].get(name, np.nan) for key in keys], dtype=float)
+               for name in KMA_FIELDS.values()}
+    return columns, len(keys)
+
+def item_matrix(compiled, fired, items):
+    """규칙별 발동 (n, 규칙) -> 물품별 발동 (n, 물품) - 여러 규칙이 같은 물품이면 OR"""
+    result = np.zeros((fired.shape[0], len(items)), dtype=bool)
+    for i, rule in enumerate(compiled.rules):
+        result[:, items.index(rule['id'])] |= fired[:, i]
+    return result
+
+def command_matrix(compiled, fired, actuators):
+    """규칙별 발동 -> 아두이노 액추에이터별 동작 여부 (n, 액추에이터)"""
+    mapping = np.zeros((len(compiled.rules), len(actuators)))
+    for i, actuator in enumerate(compiled.actuators):
+        mapping[i, actuators.index(actuator)] = 1
+    return fired.astype(float) @ mapping > 0
+
+def backtest(columns, rule_sets):
+    """{이름: CompiledRules} 를 같은 데이터에 평가해 물품/액추에이터별 결과 반환"""
+    fired = {name: compiled.evaluate(columns) for name, compiled in rule_sets.items()}
+    items = sorted({rule['id'] for compiled in rule_sets.values() for rule in compiled.rules})
+    actuators = sorted({actuator for compiled in rule_sets.values() for actuator in compiled.actuators})
+    names = {rule['id']: rule.get('name', str(rule['id'])) for compiled in rule_sets.values() for rule in compiled.rules}
+    return {
+        'items': items,
+        'names': names,
+        'actuators': actuators,
+        'fired': {name: item_matrix(rule_sets[name], f, items) for name, f in fired.items()},
+        'commands': {name: command_matrix(rule_sets[name], f, actuators) for name, f in fired.items()},
+    }
+
+def missing_fields(columns, rule_sets):
+    """규칙이 조건으로 쓰지만 데이터에 값이 하나도 없는 필드 (해당 규칙은 절대 발동하지 않음)"""
+    used = sorted({name for compiled in rule_sets.values() for name in compiled.fields})
+    return [name for name in used
+            if name not in columns or not np.isfinite(columns[name]).any()]
+
+def report(result, rows, missing=()):
+    set_names = list(result['fired'])
+    width = max(12, *(len(name) + 2 for name in set_names))
+    lines = [f"{rows:,}개 시점"]
+    if missing:
+        lines.append(f"경고: 데이터에 없는 필드 {', '.join(missing)} - 이 필드를 쓰는 규칙의 0% 는 실제 결과가 아님")
+    lines += ["", "물품별 발동 비율"]
+    lines.append(f"{'':<12}" + ''.join(f"{name:>{width}}" for name in set_names))
+    for j, item in enumerate(result['items']):
+        lines.append(f"{result['names'][item]:<12}" + ''.join(
+            f"{result['fired'][name][:, j].mean():>{width}.1%}" for name in set_names))
+
+    lines += ["", "액추에이터별 동작 비율"]
+    for j, actuator in enumerate(result['actuators']):
+        lines.append(f"{actuator + '번':<12}" + ''.join(
+            f"{result['commands'][name][:, j].mean():>{width}.1%}" for name in set_names))
+    lines.append(f"{'무동작':<12}" + ''.join(
+        f"{(~result['commands'][name].any(axis=1)).mean():>{width}.1%}" for name in set_names))
+
+    # 첫 번째 규칙 세트(기본 규칙)를 기준으로 다른 세트와 판단이 갈리는 비율
+    base = set_names[0]
+    for other in set_names[1:]:
+        differ = result['fired'][base] != result['fired'][other]
+        lines += ["", f"{base} 대비 {other} 불일치"]
+        for j, item in enumerate(result['items']):
+            lines.append(f"{result['names'][item]:<12}{differ[:, j].mean():>{width}.1%}")
+        command_differ = (result['commands'][base] != result['commands'][other]).any(axis=1)
+        lines.append(f"{'아두이노 명령':<12}{command_differ.mean():>{width}.1%}")
+    return '\n'.join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="보관 날씨 데이터로 액추에이터 규칙 백테스트")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--snapshots', help='날씨 스냅샷 JSON Lines 파일')
+    source.add_argument('--kma', help='녹화된 기상청 단기예보 XML 디렉토리')
+    source.add_argument('--history', help='날씨 이력 DB (WEATHER_HISTORY_FILE)')
+    parser.add_argument('--rules', action='append', default=[],
+                        help='기본 규칙과 비교할 규칙 파일 (여러 번 지정 가능)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.snapshots:
+        columns, rows = load_snapshots(args.snapshots)
+    elif args.kma:
+        columns, rows = load_kma(args.kma)
+    else:
+        if not os.path.exists(args.history):
+            parser.error(f"이력 파일 없음: {args.history}")
+        columns = WeatherHistory(args.history).range()
+        rows = len(columns['ts'])
+    loaded = time.perf_counter()
+
+    # 기본 규칙이 항상 비교 기준
+    rule_sets = {'default': CompiledRules(DEFAULT_RULES)}
+    for path in args.rules:
+        if not os.path.exists(path):
+            parser.error(f"규칙 파일 없음: {path}")
+        # RuleEngine 은 오류 시 기본 규칙을 유지하므로 후보 파일은 직접 컴파일 (잘못된 파일을 기본과 동일로 보고하지 않도록)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                rule_sets[os.path.basename(path)] = CompiledRules(json.load(f)['rules'])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            parser.error(f"규칙 파일 오류: {path}: {e!r}")
+    result = backtest(columns, rule_sets)
+    evaluated = time.perf_counter()
+
+    print(report(result, rows, missing_fields(columns, rule_sets)))
+    print(f"\n로드 {loaded - start:.2f}s, 평가 {evaluated - loaded:.3f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import sqlite3
+import threading
+import time
+from datetime import datetime
+import numpy as np
+from weather.rules import to_number
+
+# 저장하는 항목 (미세먼지는 등급 숫자로 저장)
+FIELDS = ('current_temp', 'precipitation', 'uv_index', 'dust', 'humidity', 'max_temp', 'min_temp')
+
+# 해상도 단계: 원본 -> 시간별 -> 일별
+RAW, HOURLY, DAILY = 0, 1, 2
+HOUR, DAY = 3600, 86400
+
+class WeatherHistory:
+    """날씨 스냅샷 시계열 저장소 (SQLite)
+
+    최근 24시간은 원본, 30일까지는 시간별 평균, 그 이전은 일별 평균으로 자동 축소하고
+    max_days 보다 오래된 일별 값은 삭제해 SD 카드 사용량을 일정하게 유지
+    """
+
+    def __init__(self, path, raw_age=DAY, hourly_age=30 * DAY, max_days=730):
+        self.raw_age = raw_age
+        self.hourly_age = hourly_age
+        self.max_days = max_days
+        self._lock = threading.Lock()
+        self.compacted = 0.0
+
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        columns = ', '.join(f'{name} REAL' for name in FIELDS)
+        self.db.execute(
+            f"CREATE TABLE IF NOT EXISTS history (tier INTEGER, ts INTEGER, count INTEGER, {columns}, "
+            "PRIMARY KEY (tier, ts)) WITHOUT ROWID"
+        )
+        self.db.commit()
+
+    def append(self, data, timestamp=None):
+        """스냅샷 한 건 추가 (표시용 문자열 그대로 받아 숫자로 변환), 한 시간마다 축소"""
+        ts = int(timestamp if timestamp is not None else time.time())
+        values = [None if np.isnan(v) else v for v in (to_number(name, data.get(name)) for name in FIELDS)]
+        with self._lock:
+            self.db.execute(
+                f"INSERT OR REPLACE INTO history VALUES (?, ?, 1, {', '.join('?' * len(FIELDS))})",
+                [RAW, ts] + values
+            )
+            self.db.commit()
+        if ts - self.compacted >= HOUR:
+            self.compact(ts)
+
+    def compact(self, now=None):
+        """기간이 지난 원본은 시간별로, 시간별은 일별로 합치고 보관 기간이 지난 일별 값 삭제"""
+        now = int(now if now is not None else time.time())
+        with self._lock:
+            # 경계를 버킷 단위로 맞춰 하나의 버킷은 항상 한 번에 통째로 옮겨짐
+            self._downsample(RAW, HOURLY, bucket_start(now - self.raw_age, HOUR), HOUR)
+            self._downsample(HOURLY, DAILY, bucket_start(now - self.hourly_age, DAY), DAY)
+            self.db.execute("DELETE FROM history WHERE tier = ? AND ts < ?", (DAILY, now - self.max_days * DAY))
+            self.db.commit()
+            self.compacted = now
+
+    def _downsample(self, source, target, cutoff, size):
+        offset = local_offset()
+        averages = ', '.join(f'SUM({name} * count) / SUM(CASE WHEN {name} IS NULL THEN 0 ELSE count END)'
+                             for name in FIELDS)
+        self.db.execute(
+            f"INSERT OR REPLACE INTO history "
+            f"SELECT ?, ts - ((ts + ?) % ?) AS bucket, SUM(count), {averages} "
+            f"FROM history WHERE tier = ? AND ts < ? GROUP BY bucket",
+            (target, offset, size, source, cutoff)
+        )
+        self.db.execute("DELETE FROM history WHERE tier = ? AND ts < ?", (source, cutoff))
+
+    def range(self, start=0, end=None, fields=FIELDS):
+        """구간의 모든 값을 시간순 열 배열로 반환 {'ts': ..., 필드: ...} (해상도는 구간마다 다름)"""
+        end = end if end is not None else time.time()
+        with self._lock:
+            rows = self.db.execute(
+                f"SELECT ts, {', '.join(fields)} FROM history WHERE ts >= ? AND ts < ? ORDER BY ts",
+                (start, end)
+            ).fetchall()
+        table = np.array(rows, dtype=float).reshape(len(rows), len(fields) + 1)
+        columns = {name: table[:, i + 1] for i, name in enumerate(fields)}
+        columns['ts'] = table[:, 0]
+        return columns
+
+    def aggregate(self, field, start, end=None, bucket=HOUR):
+        """버킷별 평균/최저/최고 (스파크라인 등) -> {'ts', 'mean', 'min', 'max'} 배열"""
+        if field not in FIELDS:
+            raise ValueError(f"알 수 없는 항목: {field}")
+        end = end if end is not None else time.time()
+        with self._lock:
+            rows = self.db.execute(
+                f"SELECT ts - ((ts + ?) % ?) AS bucket, SUM({field} * count) / SUM(count), "
+                f"MIN({field}), MAX({field}) FROM history "
+                f"WHERE ts >= ? AND ts < ? AND {field} IS NOT NULL GROUP BY bucket ORDER BY bucket",
+                (local_offset(), bucket, start, end)
+            ).fetchall()
+        table = np.array(rows, dtype=float).reshape(len(rows), 4)
+        return {'ts': table[:, 0], 'mean': table[:, 1], 'min': table[:, 2], 'max': table[:, 3]}
+
+    def trend(self, field, window=3 * HOUR, now=None):
+        """최근 window 초 동안의 시간당 변화량 (최소제곱 기울기, 값이 2개 미만이면 NaN)"""
+        now = now if now is not None else time.time()
+        columns = self.range(now - window, now + 1, (field,))
+        ts, values = columns['ts'], columns[field]
+        valid = ~np.isnan(values)
+        if valid.sum() < 2 or np.ptp(ts[valid]) == 0:
+            return np.nan
+        slope = np.polyfit(ts[valid] / HOUR, values[valid], 1)[0]
+        return float(slope)
+
+    def close(self):
+        with self._lock:
+            self.db.close()
+
+def bucket_start(ts, size):
+    """로컬 시간 기준 버킷(시, 일) 시작 시각"""
+    return ts - (ts + local_offset()) % size
+
+def local_offset():
+    return int(datetime.now().astimezone().utcoffset().total_seconds())
@@ -0,0 +1,165 @@
+import argparse
+import json
+import os
+import re
+from dataclasses import dataclass, field
+import numpy as np
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# 규칙 파일이 없을 때 사용하는 기본 규칙표
+# id: ACTUATOR_POP 으로 전달되는 물품 번호, actuator: 아두이노 액추에이터 번호
+# priority: 작을수록 먼저 (needed 순서, 같은 액추에이터를 쓰는 규칙 중 대표 사유)
+# when: [필드, 연산자, 값] 조건 목록 - 모두 만족하면 발동
+DEFAULT_RULES = [
+    {'id': 1, 'name': '우산', 'actuator': '1', 'priority': 1,
+     'when': [['precipitation', '>=', 0]], 'reason': '강수확률: {precipitation}%'},
+    {'id': 2, 'name': '선크림', 'actuator': '4', 'priority': 2,
+     'when': [['uv_index', '>=', 6]], 'reason': '자외선지수: {uv_index}'},
+    {'id': 3, 'name': '선글라스', 'actuator': '4', 'priority': 3,
+     'when': [['uv_index', '>=', 3]], 'reason': '자외선지수: {uv_index}'},
+    {'id': 4, 'name': '마스크', 'actuator': '3', 'priority': 4,
+     'when': [['dust', '>=', '나쁨']], 'reason': '미세먼지: {dust}'},
+    {'id': 5, 'name': '핫팩', 'actuator': '2', 'priority': 5,
+     'when': [['current_temp', '<=', 40]], 'reason': '온도: {current_temp}°C'},
+]
+
+# 미세먼지 등급은 순서형 숫자로 비교 ('매우 나쁨' / '매우나쁨' 모두 허용)
+DUST_GRADES = {'좋음': 1, '보통': 2, '나쁨': 3, '매우나쁨': 4}
+OPS = ('>=', '>', '<=', '<', '==')
+NUMBER = re.compile(r'\s*-?\d+(?:\.\d+)?')
+
+def to_number(name, value):
+    """'23°C', '60%', '나쁨' 같은 표시 값을 비교용 숫자로 변환 (알 수 없으면 NaN - 조건 불만족)"""
+    if value is None:
+        return np.nan
+    if name == 'dust':
+        return float(DUST_GRADES.get(str(value).replace(' ', ''), np.nan))
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = NUMBER.match(str(value))
+    return float(match.group()) if match else np.nan
+
+def columns_from_records(records, names):
+    """스냅샷 목록 -> {필드: float 배열} 열 형식"""
+    return {name: np.array([to_number(name, record.get(name)) for record in records], dtype=float)
+            for name in names}
+
+@dataclass
+class Decision:
+    needed: list                                   # 물품 번호 (우선순위 순)
+    targets: list                                  # 아두이노 액추에이터 번호 (정렬, 중복 제거)
+    reasons: dict = field(default_factory=dict)    # 물품 번호 -> 사유
+
+class CompiledRules:
+    """규칙표를 조건 배열로 바꿔 여러 스냅샷을 NumPy 한 번에 평가"""
+
+    def __init__(self, rules):
+        if not rules:
+            raise ValueError("규칙이 하나도 없음")
+        self.rules = sorted(rules, key=lambda rule: rule.get('priority', 0))
+        cond_field, cond_op, cond_value, starts = [], [], [], []
+        for rule in self.rules:
+            if not rule.get('when'):
+                raise ValueError(f"조건이 없는 규칙: {rule.get('name', rule.get('id'))}")
+            starts.append(len(cond_field))
+            for name, op, value in rule['when']:
+                if op not in OPS:
+                    raise ValueError(f"지원하지 않는 연산자: {op}")
+                threshold = to_number(name, value)
+                if np.isnan(threshold):
+                    raise ValueError(f"비교할 수 없는 값: {name} {op} {value}")
+                cond_field.append(name)
+                cond_op.append(OPS.index(op))
+                cond_value.append(threshold)
+
+        self.fields = sorted(set(cond_field))
+        self.cond_field = cond_field
+        self.cond_op = np.array(cond_op)
+        self.cond_value = np.array(cond_value, dtype=float)
+        self.starts = np.array(starts)
+        self.ids = np.array([rule['id'] for rule in self.rules])
+        self.actuators = [str(rule['actuator']) for rule in self.rules]
+
+        # 평가와 사유 문자열 생성을 미리 한 번 실행 - 오류는 날씨 갱신 때가 아니라 로드할 때 발생
+        self.evaluate({name: np.zeros(1) for name in self.fields})
+        placeholders = {name: '' for name in self.fields}
+        for rule in self.rules:
+            try:
+                rule.get('reason', '').format_map(placeholders)
+            except (KeyError, IndexError) as e:
+                raise ValueError(f"사유에 조건에 없는 필드 사용: {rule.get('name', rule.get('id'))} {e}") from e
+
+    def evaluate(self, columns):
+        """{필드: (n,) 배열} -> 발동 여부 (n, 규칙 수) bool 배열 (열 순서는 self.rules)"""
+        size = len(next(iter(columns.values()))) if columns else 0
+        missing = np.full(size, np.nan)
+        values = np.stack([columns.get(name, missing) for name in self.cond_field], axis=1)
+        threshold = self.cond_value
+        with np.errstate(invalid='ignore'):
+            met = np.select(
+                [self.cond_op == i for i in range(len(OPS))],
+                [values >= threshold, values > threshold, values <= threshold, values < threshold, values == threshold]
+            )
+        return np.logical_and.reduceat(met, self.starts, axis=1)
+
+    def decide(self, data):
+        """단일 스냅샷 평가 결과를 물품 번호, 아두이노 번호, 사유로 정리"""
+        fired = self.evaluate(columns_from_records([data], self.fields))[0]
+        needed, targets, reasons = [], [], {}
+        for i in np.flatnonzero(fired):
+            rule = self.rules[i]
+            needed.append(rule['id'])
+            if self.actuators[i] not in targets:
+                targets.append(self.actuators[i])
+            reasons[rule['id']] = f"{rule.get('name', rule['id'])} 필요 - " + rule.get('reason', '').format_map(
+                {name: data.get(name, '?') for name in self.fields}
+            )
+        return Decision(needed, sorted(targets), reasons)
+
+class RuleEngine:
+    """규칙 파일을 mtime 으로 감시해 바뀌면 다시 컴파일 (키오스크 재시작 불필요)"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.mtime = None
+        self.compiled = CompiledRules(DEFAULT_RULES)
+        self.reload()
+
+    def reload(self):
+        """파일이 바뀌었으면 다시 읽음 - 잘못된 파일이면 기존 규칙 유지"""
+        if not self.path or not os.path.exists(self.path):
+            return self.compiled
+        mtime = os.path.getmtime(self.path)
+        if mtime == self.mtime:
+            return self.compiled
+        self.mtime = mtime
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.compiled = CompiledRules(json.load(f)['rules'])
+            log.info("액추에이터 규칙 로드", path=self.path, rules=len(self.compiled.rules))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            log.error("규칙 파일 오류, 기존 규칙 유지", error=e)
+        return self.compiled
+
+    def decide(self, data):
+        return self.reload().decide(data)
+
+    def evaluate(self, records):
+        """스냅샷 목록을 한 번에 평가 -> (발동 배열, 규칙 목록)"""
+        compiled = self.reload()
+        return compiled.evaluate(columns_from_records(records, compiled.fields)), compiled.rules
+
+def main():
+    parser = argparse.ArgumentParser(description="액추에이터 규칙 파일 생성")
+    parser.add_argument('--output', default='config/rules.json')
+    args = parser.parse_args()
+
+    CompiledRules(DEFAULT_RULES)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'rules': DEFAULT_RULES}, f, ensure_ascii=False, indent=2)
+    print(f"기본 규칙 저장: {args.output}")
+
+if __name__ == "__main__":
+    main()
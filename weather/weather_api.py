@@ -3,14 +3,25 @@ from datetime import datetime, timedelta
 import xml.etree.ElementTree as ET
 import os
 from dotenv import load_dotenv
+from utils import metrics
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+REQUEST_SECONDS = metrics.histogram('weather_api_request_seconds', '날씨 API 요청 시간', ('service',))
+REQUEST_ERRORS = metrics.counter('weather_api_errors', '날씨 API 요청 실패 (예외, 200 이외 응답)', ('service',))
+CACHE_LOOKUPS = metrics.counter('weather_api_cache_lookups', '날씨 데이터 캐시 조회 (hit, miss)', ('result',))
 
 # .env 파일 로드
 load_dotenv()
 
 class WeatherAPI:
     def __init__(self):
-        # .env 파일에서 API 키 로드
-        self.KEY = os.getenv('WEATHER_KEY')
+        # 설정되어 있으면 data.go.kr 대신 로컬 시뮬레이터 사용 (simulator/upstream.py)
+        self.BASE_URL = os.getenv('UPSTREAM_SIMULATOR_URL') or "http://apis.data.go.kr"
+
+        # .env 파일에서 API 키 로드 (시뮬레이터는 키를 확인하지 않음)
+        self.KEY = os.getenv('WEATHER_KEY') or (os.getenv('UPSTREAM_SIMULATOR_URL') and 'simulator')
         
         # API 키가 없으면 에러 발생
         if not self.KEY:
@@ -26,9 +37,21 @@ class WeatherAPI:
         """XML 파싱 유틸 함수"""
         return ET.fromstring(xml_text)
     
+    def request(self, service, url, params):
+        """서비스별 요청 시간과 실패 수 기록"""
+        with REQUEST_SECONDS.labels(service).time():
+            try:
+                res = requests.get(url, params=params, timeout=10)
+            except Exception:
+                REQUEST_ERRORS.labels(service).inc()
+                raise
+        if res.status_code != 200:
+            REQUEST_ERRORS.labels(service).inc()
+        return res
+    
     def get_ultra_nowcast(self, nx, ny, base_date, base_time):
         """현재 기온, 강수형태, 1시간 강수량 (초단기실황)"""
-        url = "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getUltraSrtNcst"
+        url = f"{self.BASE_URL}/1360000/VilageFcstInfoService_2.0/getUltraSrtNcst"
         params = {
             "serviceKey": self.KEY,
             "pageNo": "1",
@@ -41,7 +64,7 @@ class WeatherAPI:
         }
         
         try:
-            res = requests.get(url, params=params, timeout=10)
+            res = self.request('nowcast', url, params)
             root = self.parse_xml(res.text)
             result = {}
             for item in root.iter("item"):
@@ -50,12 +73,12 @@ class WeatherAPI:
                 result[category] = value
             return result
         except Exception as e:
-            print(f"초단기실황 API 오류: {e}")
+            log.error("초단기실황 API 오류", error=e)
             return {}
     
     def get_vilage_fcst(self, nx, ny, base_date, base_time):
         """강수확률, 금일 최저/최고기온, 습도 (단기예보)"""
-        url = "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getVilageFcst"
+        url = f"{self.BASE_URL}/1360000/VilageFcstInfoService_2.0/getVilageFcst"
         params = {
             "serviceKey": self.KEY,
             "pageNo": "1",
@@ -68,7 +91,7 @@ class WeatherAPI:
         }
         
         try:
-            res = requests.get(url, params=params, timeout=10)
+            res = self.request('forecast', url, params)
             root = self.parse_xml(res.text)
             fcst = {'POP': None, 'TMN': None, 'TMX': None, 'REH': None, 'SKY': None}
             for item in root.iter("item"):
@@ -78,13 +101,13 @@ class WeatherAPI:
                     fcst[cat] = val
             return fcst
         except Exception as e:
-            print(f"단기예보 API 오류: {e}")
+            log.error("단기예보 API 오류", error=e)
             return {'POP': None, 'TMN': None, 'TMX': None, 'REH': None, 'SKY': None}
     
     def get_uv_index(self):
         """자외선 지수"""
         date_str = datetime.now().strftime("%Y%m%d%H")
-        url = "http://apis.data.go.kr/1360000/LivingWthrIdxServiceV4/getUVIdxV4"
+        url = f"{self.BASE_URL}/1360000/LivingWthrIdxServiceV4/getUVIdxV4"
         params = {
             "serviceKey": self.KEY,
             "areaNo": 1168058000,
@@ -93,7 +116,7 @@ class WeatherAPI:
         }
         
         try:
-            res = requests.get(url, params=params, timeout=10)
+            res = self.request('uv', url, params)
             if res.status_code != 200:
                 return f"API 호출 실패: {res.status_code}"
             
@@ -105,12 +128,12 @@ class WeatherAPI:
             uv_value = item.find("h0")
             return uv_value.text if uv_value is not None and uv_value.text.strip() else "정보없음"
         except Exception as e:
-            print(f"자외선 지수 API 오류: {e}")
+            log.error("자외선 지수 API 오류", error=e)
             return "정보없음"
     
     def get_air_quality(self, station="강남구"):
         """미세먼지 정보 (한국환경공단, 에어코리아)"""
-        url = "http://apis.data.go.kr/B552584/ArpltnInforInqireSvc/getMsrstnAcctoRltmMesureDnsty"
+        url = f"{self.BASE_URL}/B552584/ArpltnInforInqireSvc/getMsrstnAcctoRltmMesureDnsty"
         params = {
             "serviceKey": self.KEY,
             "returnType": "xml",
@@ -122,14 +145,14 @@ class WeatherAPI:
         }
         
         try:
-            res = requests.get(url, params=params, timeout=10)
+            res = self.request('air', url, params)
             root = self.parse_xml(res.text)
             pm10 = root.find(".//pm10Grade")
             pm10_val = pm10.text if pm10 is not None else "정보없음"
             pm10_txt = {"1": "좋음", "2": "보통", "3": "나쁨", "4": "매우 나쁨"}.get(pm10_val, "정보없음")
             return pm10_txt
         except Exception as e:
-            print(f"미세먼지 API 오류: {e}")
+            log.error("미세먼지 API 오류", error=e)
             return "정보없음"
     
     def get_all_weather_data(self, force_refresh=False):
@@ -141,17 +164,19 @@ class WeatherAPI:
             self.last_update_time and 
             self.cached_data and 
             (now - self.last_update_time).total_seconds() < 300):  # 5분
-            print("캐시된 데이터 사용")
+            log.debug("캐시된 데이터 사용")
+            CACHE_LOOKUPS.labels('hit').inc()
             return self.cached_data
         
-        print("새로운 API 호출 실행")
+        log.debug("새로운 API 호출 실행")
+        CACHE_LOOKUPS.labels('miss').inc()
         
         # 시간 설정 (원본 코드와 동일)
         date_str = now.strftime("%Y%m%d")
         time_str = now.strftime("%H%M")
         base_time = (now - timedelta(minutes=20)).strftime("%H00")
         
-        print(f"요청에 사용된 base_time: {base_time}")
+        log.debug("요청 base_time", base_time=base_time)
         
         # API 호출 (원본 코드와 동일한 방식)
         nowcast = self.get_ultra_nowcast(self.NX, self.NY, date_str, base_time)
@@ -176,12 +201,12 @@ class WeatherAPI:
             'rain_amount': f"{nowcast.get('RN1', '0')}mm"
         }
         
-        # 콘솔 출력 (원본 코드와 동일)
-        print(f"""{date_str[:4]}년 {date_str[4:6]}월 {date_str[6:]}일 {time_str[:2]}시 {time_str[2:]}분
-위치 ({self.NX}, {self.NY})
-현재 [기온 {nowcast.get('T1H','?')}℃, 강수형태 {nowcast.get('PTY','없음')}, 1시간 강수량 {nowcast.get('RN1','강수없음')}mm
-자외선 지수 {uv}, 미세먼지 {pm10}]
-오늘 [{sky_txt}, 습도 {vilage.get('REH','?')}%, 최저 기온 {vilage.get('TMN','?')}℃ / 최고 기온 {vilage.get('TMX','?')}℃]""")
+        log.info(
+            "날씨 조회", date=date_str, time=time_str, grid=(self.NX, self.NY),
+            temp=nowcast.get('T1H', '?'), pty=nowcast.get('PTY', '없음'), rain=nowcast.get('RN1', '강수없음'),
+            uv=uv, dust=pm10, sky=sky_txt, humidity=vilage.get('REH', '?'),
+            min_temp=vilage.get('TMN', '?'), max_temp=vilage.get('TMX', '?')
+        )
         
         # 캐시 업데이트
         self.cached_data = weather_data
@@ -5,13 +5,26 @@ from datetime import datetime
 from config.settings import Settings
 from events.event_types import Event, EventType
 from weather.weather_api import WeatherAPI
+from weather.rules import RuleEngine
+from weather.history import WeatherHistory
+from utils.logger import get_logger
+
+log = get_logger(__name__)
 
 class WeatherService:
     def __init__(self, event_bus, settings: Settings):
         self.event_bus = event_bus
         self.settings = settings
         self.weather_api = WeatherAPI()
+        # 날씨 -> 액추에이터 규칙표 (파일이 바뀌면 다음 판단 때 다시 로드)
+        self.rules = RuleEngine(settings.RULES_FILE)
+        # 스냅샷 이력 (추세 계산용, 파일 경로가 비어 있으면 사용 안 함)
+        self.history = None
+        if settings.WEATHER_HISTORY_FILE:
+            self.history = WeatherHistory(settings.WEATHER_HISTORY_FILE, max_days=settings.WEATHER_HISTORY_MAX_DAYS)
         self.last_data = {}
+        # 화면 표시용 원본 데이터 (WEATHER_SNAPSHOT 으로 발행)
+        self.snapshot = None
         
         # 기존 WEATHER_UPDATE 이벤트 구독
         self.event_bus.subscribe(EventType.WEATHER_UPDATE, self.handle_update)
@@ -20,24 +33,43 @@ class WeatherService:
 
     async def handle_human_detected(self, event):
         """사람 감지시 즉시 날씨 업데이트"""
-        print("PIR 센서에서 사람 감지됨 - 날씨 업데이트 시작")
+        log.info("PIR 센서에서 사람 감지됨 - 날씨 업데이트 시작")
         await self.handle_update(Event(EventType.WEATHER_UPDATE, {}))
 
     async def handle_update(self, event):
-        print("날씨 서비스 업데이트 시작")
-        data = await self.fetch_data()
+        log.debug("날씨 서비스 업데이트 시작")
+        data = await self.fetch_data(force_refresh=event.detail.get('force_refresh', False))
         self.last_data = data
-        needed = self.determine_needed(data)
-        print(f"needed 큐 : {needed}")
+        await self.publish_snapshot()
+        decision = self.determine_needed(data)
+        log.info("필요 물품 결정", needed=decision.needed)
         
-        if needed:
-            await self.event_bus.emit(Event(EventType.ACTUATOR_POP, {'needed': needed}))
+        if decision.needed:
+            await self.event_bus.emit(Event(EventType.ACTUATOR_POP, {
+                'needed': decision.needed, 'targets': decision.targets, 'reasons': decision.reasons
+            }))
+
+    async def publish_snapshot(self):
+        """액추에이터 판단에 쓴 것과 같은 데이터를 화면 등 구독자에게 전달"""
+        if self.snapshot is not None:
+            detail = {'data': self.snapshot, 'timestamp': datetime.now()}
+        else:
+            detail = {'error': '날씨 데이터를 가져오지 못했습니다'}
+        await self.event_bus.emit(Event(EventType.WEATHER_SNAPSHOT, detail))
 
-    async def fetch_data(self):
+    async def refresh_snapshot(self):
+        """액추에이터 동작 없이 데이터만 갱신해 발행 (시작 시 화면 초기값용)"""
+        self.last_data = await self.fetch_data()
+        await self.publish_snapshot()
+
+    async def fetch_data(self, force_refresh=False):
         """실제 API에서 날씨 데이터 가져오기"""
         try:
-            # weather_api.py의 API 사용
-            raw_data = self.weather_api.get_all_weather_data()
+            # weather_api.py의 API 사용 (동기 HTTP 요청이므로 이벤트 루프 밖에서)
+            raw_data = await asyncio.get_running_loop().run_in_executor(
+                None, lambda: self.weather_api.get_all_weather_data(force_refresh=force_refresh)
+            )
+            self.snapshot = raw_data
             
             # 액추에이터 로직을 위해 숫자 값 추출
             data = {
@@ -45,14 +77,21 @@ class WeatherService:
                 'precipitation': raw_data['precipitation'].replace('%', ''),
                 'uv_index': raw_data['uv_index'],
                 'dust': raw_data['dust'],
-                'humidity': raw_data['humidity'].replace('%', '')
+                'humidity': raw_data['humidity'].replace('%', ''),
+                'max_temp': raw_data['max_temp'].replace('°C', ''),
+                'min_temp': raw_data['min_temp'].replace('°C', '')
             }
             
-            print(f"날씨 데이터 업데이트: 온도 {data['current_temp']}°C, 강수확률 {data['precipitation']}%")
+            if self.history:
+                # 이력 저장과 추세 계산도 이벤트 루프 밖에서 (같은 조회 시각은 한 번만 저장됨)
+                data['temp_trend'] = await asyncio.get_running_loop().run_in_executor(None, self.record_history, raw_data)
+
+            log.info("날씨 데이터 업데이트", temp=data['current_temp'], pop=data['precipitation'])
             return data
             
         except Exception as e:
-            print(f"날씨 API 호출 오류: {e}")
+            log.error("날씨 API 호출 오류", error=e)
+            self.snapshot = None
             # 기본값 반환
             return {
                 'current_temp': '25',
@@ -62,54 +101,22 @@ class WeatherService:
                 'humidity': '50'
             }
 
+    def record_history(self, raw_data):
+        """조회 결과를 이력에 추가하고 최근 3시간 기온 변화량(°C/시간) 반환 - 규칙의 temp_trend 필드"""
+        self.history.append(raw_data, self.weather_api.last_update_time.timestamp())
+        return self.history.trend('current_temp')
+
     def determine_needed(self, data):
-        """필요한 액추에이터 결정"""
-        needed = []
-        
-        try:
-            # 강수확률 체크
-            if int(data['precipitation']) >= self.settings.THRESHOLDS['precipitation']:
-                needed.append(1)  # 우산 -> 아두이노 1번 (우산)
-                print(f"우산 필요 - 강수확률: {data['precipitation']}%")
-            
-            # 자외선 지수 체크
-            if data['uv_index'].isdigit():
-                uv_val = int(data['uv_index'])
-                if uv_val >= self.settings.THRESHOLDS['uv_sunscreen']:
-                    needed.append(2)  # 선크림 -> 아두이노 4번 (선글라스+선크림)
-                    print(f"선크림 필요 - 자외선지수: {uv_val}")
-                if uv_val >= self.settings.THRESHOLDS['uv_sunglasses']:
-                    needed.append(3)  # 선글라스 -> 아두이노 4번 (선글라스+선크림)
-                    print(f"선글라스 필요 - 자외선지수: {uv_val}")
-            
-            # 미세먼지 체크
-            if data['dust'] in self.settings.THRESHOLDS['dust_bad']:
-                needed.append(4)  # 마스크 -> 아두이노 3번 (마스크)
-                print(f"마스크 필요 - 미세먼지: {data['dust']}")
-            
-            # 온도 체크 (추위)
-            if is_numeric(data['current_temp']):
-                temp_val = float(data['current_temp'])
-                if temp_val <= self.settings.THRESHOLDS['cold_temp']:
-                    needed.append(5)  # 외투/따뜻함 -> 아두이노 2번 (핫팩)
-                    print(f"핫팩 필요 - 온도: {temp_val}°C")
-                    
-        except Exception as e:
-            print(f"액추에이터 결정 오류: {e}")
-            
-        return needed
+        """규칙표로 필요한 물품, 아두이노 액추에이터, 사유 결정"""
+        decision = self.rules.decide(data)
+        for reason in decision.reasons.values():
+            log.info(reason)
+        return decision
 
     async def start(self):
-        print("날씨 서비스 시작됨")
+        """정기 업데이트 루프 (첫 조회는 시작 단계에서 refresh_snapshot 으로 수행)"""
+        log.info("날씨 서비스 시작됨")
         while True:
             await asyncio.sleep(self.settings.WEATHER_UPDATE_INTERVAL)
-            print("정기 날씨 업데이트 중...")
+            log.info("정기 날씨 업데이트 중...")
             await self.handle_update(Event(EventType.WEATHER_UPDATE, {}))
-
-def is_numeric(value):
-    """소수점 포함 숫자 검증"""
-    try:
-        float(value)
-        return True
-    except (ValueError, TypeError):
-        return False